@@ -0,0 +1,90 @@
+import importlib
+import math
+import os.path
+import tempfile
+import timeit
+import unittest
+from dataclasses import dataclass
+from random import Random
+
+
+@dataclass(frozen=True)
+class Sample:
+    scale: float
+    size: int
+    seconds: float
+
+
+@dataclass(frozen=True)
+class Curve:
+    year: int
+    day: int
+    task: int
+    samples: list[Sample]
+    bound: float
+
+    @property
+    def exponent(self) -> float:
+        # least squares slope of log(seconds) over log(size)
+        xs = [math.log(s.size) for s in self.samples]
+        ys = [math.log(max(s.seconds, 1e-9)) for s in self.samples]
+        mean_x = sum(xs) / len(xs)
+        mean_y = sum(ys) / len(ys)
+        num = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+        den = sum((x - mean_x) ** 2 for x in xs)
+        return num / den if den > 0 else 0.0
+
+    @property
+    def within_bound(self) -> bool:
+        return self.exponent <= self.bound
+
+
+def generators(year: int) -> dict:
+    return importlib.import_module(f"benchmark.year{year}").GENERATORS
+
+
+def measure(year: int, day: int, task: int, scales: list[float], seed: int = 0, repeat: int = 3) -> Curve:
+    settings = importlib.import_module(f"benchmark.year{year}")
+    generator = settings.GENERATORS[day]
+    module = importlib.import_module(f"year{year}.day{day:02}.task{task}")
+
+    samples = []
+    with tempfile.TemporaryDirectory() as directory:
+        for scale in scales:
+            content = generator(Random(seed), scale)
+            filename = os.path.join(directory, f"day{day:02}_{scale}.txt")
+            with open(filename, "w") as fp:
+                fp.write(content)
+            seconds = min(timeit.repeat(lambda: module.task(filename), repeat=repeat, number=1))
+            samples.append(Sample(scale, len(content), seconds))
+
+    return Curve(year, day, task, samples, settings.BOUNDS[(day, task)])
+
+
+class TestCases(unittest.TestCase):
+    def test_exponent(self):
+        samples = [Sample(s, 100 * s, 0.001 * s * s) for s in (1, 2, 4, 8)]
+        self.assertAlmostEqual(Curve(2024, 0, 0, samples, 2.0).exponent, 2.0)
+
+    def test_generators_are_seeded(self):
+        for day, generator in generators(2024).items():
+            self.assertEqual(generator(Random(7), 0.1), generator(Random(7), 0.1), f"day {day}")
+
+    def test_day06_path_grows(self):
+        # the guard has to leave the map, otherwise task2 returns before checking any candidate
+        settings = importlib.import_module("benchmark.year2024")
+        lengths = [settings.day06_path(settings.day06(Random(0), scale).split()) for scale in (1, 2, 4, 8)]
+        self.assertNotIn(None, lengths)
+        self.assertGreater(lengths[0], 1000)
+        for shorter, longer in zip(lengths, lengths[1:]):
+            self.assertGreater(longer, 1.5 * shorter)
+
+    # wall clock exponents are noisy and slow to measure, `bootstrap.py bench` is the place for them
+    @unittest.skipUnless(os.environ.get("AOC_SCALING_TESTS"), "set AOC_SCALING_TESTS=1 to time the scaling bounds")
+    def test_scaling(self):
+        settings = importlib.import_module("benchmark.year2024")
+        for day, task in settings.BOUNDS:
+            scales = settings.TEST_SCALES.get((day, task), [2, 4, 8])
+            curve = measure(2024, day, task, scales, repeat=5)
+            with self.subTest(day=day, task=task):
+                self.assertTrue(curve.within_bound, f"runtime grows as size^{curve.exponent:.2f}, above {curve.bound}")
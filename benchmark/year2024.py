@@ -0,0 +1,226 @@
+import itertools
+import math
+import string
+from random import Random
+
+# Each generator produces an input of roughly `scale` times the size of the real puzzle input.
+# Day 4 has no generator: its task1.py holds puzzle text instead of code, so there is nothing to run.
+
+
+def day01(rng: Random, scale: float) -> str:
+    lines = []
+    for _ in range(max(1, round(1000 * scale))):
+        lines.append(f"{rng.randint(10000, 99999)}   {rng.randint(10000, 99999)}")
+    return "\n".join(lines) + "\n"
+
+
+def day02(rng: Random, scale: float) -> str:
+    lines = []
+    for _ in range(max(1, round(1000 * scale))):
+        direction = rng.choice([-1, 1])
+        values = [rng.randint(10, 90)]
+        for _ in range(rng.randint(4, 7)):
+            values.append(values[-1] + direction * rng.randint(1, 3))
+        if rng.random() < 0.5:
+            values[rng.randrange(len(values))] += rng.randint(-5, 5)
+        lines.append(" ".join(str(v) for v in values))
+    return "\n".join(lines) + "\n"
+
+
+def day03(rng: Random, scale: float) -> str:
+    noise = "mul(don't)do(,)[]{}<>'!@#$%^&*-+ 0123456789"
+    lines = []
+    for _ in range(max(1, round(6 * scale))):
+        parts = []
+        for _ in range(200):
+            parts.append("".join(rng.choice(noise) for _ in range(rng.randint(0, 12))))
+            match rng.randrange(10):
+                case 0:
+                    parts.append("do()")
+                case 1:
+                    parts.append("don't()")
+                case _:
+                    parts.append(f"mul({rng.randint(1, 999)},{rng.randint(1, 999)})")
+        lines.append("".join(parts))
+    return "\n".join(lines) + "\n"
+
+
+def day05(rng: Random, scale: float) -> str:
+    # the page universe grows with the scale, so both the rule and the update count grow linearly
+    page_count = max(5, round(49 * math.sqrt(scale)))
+    pages = rng.sample(range(10, 10 + 2 * page_count), page_count)
+    lines = []
+    for i in range(page_count):
+        for j in range(i + 1, page_count):
+            lines.append(f"{pages[i]}|{pages[j]}")
+    rng.shuffle(lines)
+    lines.append("")
+    for _ in range(max(1, round(200 * scale))):
+        update = rng.sample(pages, rng.randrange(5, min(24, page_count + 1), 2))
+        if rng.random() < 0.5:
+            update.sort(key=pages.index)
+        lines.append(",".join(str(p) for p in update))
+    return "\n".join(lines) + "\n"
+
+
+def day06_path(rows: list[str]) -> int | None:
+    # number of distinct cells the guard visits before leaving the map, None when it loops
+    x, y = next((row.index("^"), iy) for iy, row in enumerate(rows) if "^" in row)
+    dx, dy = (0, 1, 0, -1), (-1, 0, 1, 0)
+    direction = 0
+    states = set()
+    while (x, y, direction) not in states:
+        states.add((x, y, direction))
+        nx, ny = x + dx[direction], y + dy[direction]
+        if not (0 <= ny < len(rows) and 0 <= nx < len(rows[ny])):
+            return len({(sx, sy) for sx, sy, _ in states})
+        if rows[ny][nx] == "#":
+            direction = (direction + 1) % 4
+        else:
+            x, y = nx, ny
+    return None
+
+
+def day06(rng: Random, scale: float) -> str:
+    # the guard starts in the middle and is led out on a right turning spiral whose rings are
+    # 2 to 4 cells apart, so the path covers a fixed share of the map and always ends outside;
+    # noise crates are only placed off the path, they don't change the walk but give the
+    # candidate obstacles of task2 something to run into
+    side = max(10, round(130 * math.sqrt(scale)))
+    dx, dy = (0, 1, 0, -1), (-1, 0, 1, 0)
+    x = y = side // 2
+    crates = set()
+    path = {(x, y)}
+    # arm k is 2 to 4 cells longer than arm k - 2, which keeps the rings apart
+    lengths = [rng.randint(1, 3), rng.randint(1, 3)]
+    direction = 0
+    for arm in itertools.count():
+        if arm >= 2:
+            lengths.append(lengths[arm - 2] + rng.randint(2, 4))
+        for _ in range(lengths[arm]):
+            x, y = x + dx[direction], y + dy[direction]
+            if not (0 <= x < side and 0 <= y < side):
+                break
+            path.add((x, y))
+        else:
+            crate = (x + dx[direction], y + dy[direction])
+            if 0 <= crate[0] < side and 0 <= crate[1] < side:
+                crates.add(crate)
+                direction = (direction + 1) % 4
+                continue
+        break
+
+    rows = []
+    for iy in range(side):
+        row = []
+        for ix in range(side):
+            if (ix, iy) in crates or ((ix, iy) not in path and rng.random() < 0.05):
+                row.append("#")
+            else:
+                row.append(".")
+        rows.append(row)
+    rows[side // 2][side // 2] = "^"
+    return "\n".join("".join(row) for row in rows) + "\n"
+
+
+def day07(rng: Random, scale: float) -> str:
+    lines = []
+    for _ in range(max(1, round(850 * scale))):
+        parts = [rng.randint(1, 999) for _ in range(rng.randint(3, 12))]
+        value = parts[0]
+        for part in parts[1:]:
+            match rng.randrange(3):
+                case 0:
+                    value += part
+                case 1:
+                    value *= part
+                case 2:
+                    value = int(f"{value}{part}")
+        if rng.random() < 0.5:
+            value += rng.randint(1, 9)
+        lines.append(f"{value}: {' '.join(str(p) for p in parts)}")
+    return "\n".join(lines) + "\n"
+
+
+def day08(rng: Random, scale: float) -> str:
+    # the frequency alphabet is fixed, so antennas per frequency (and the pairs among them) grow with the scale
+    side = max(10, round(50 * math.sqrt(scale)))
+    frequencies = string.digits + string.ascii_uppercase + string.ascii_lowercase
+    rows = [["."] * side for _ in range(side)]
+    for _ in range(max(1, round(235 * scale))):
+        rows[rng.randrange(side)][rng.randrange(side)] = rng.choice(frequencies)
+    return "\n".join("".join(row) for row in rows) + "\n"
+
+
+def day09(rng: Random, scale: float) -> str:
+    length = max(1, round(10000 * scale))
+    digits = []
+    for i in range(2 * length - 1):
+        digits.append(str(rng.randint(1, 9) if i % 2 == 0 else rng.randint(0, 9)))
+    return "".join(digits) + "\n"
+
+
+def day10(rng: Random, scale: float) -> str:
+    side = max(10, round(45 * math.sqrt(scale)))
+    rows = []
+    for y in range(side):
+        rows.append("".join(str((x + y + rng.randint(0, 1)) % 10) for x in range(side)))
+    return "\n".join(rows) + "\n"
+
+
+def day13(rng: Random, scale: float) -> str:
+    blocks = []
+    for _ in range(max(1, round(320 * scale))):
+        a = (rng.randint(10, 99), rng.randint(10, 99))
+        b = a
+        while a[0] * b[1] == a[1] * b[0]:
+            b = (rng.randint(10, 99), rng.randint(10, 99))
+        pa, pb = rng.randint(1, 100), rng.randint(1, 100)
+        prize = (pa * a[0] + pb * b[0], pa * a[1] + pb * b[1])
+        if rng.random() < 0.5:
+            prize = (prize[0] + rng.randint(1, 9), prize[1])
+        blocks.append(f"Button A: X+{a[0]}, Y+{a[1]}\nButton B: X+{b[0]}, Y+{b[1]}\nPrize: X={prize[0]}, Y={prize[1]}\n")
+    return "\n".join(blocks)
+
+
+GENERATORS = {
+    1: day01,
+    2: day02,
+    3: day03,
+    5: day05,
+    6: day06,
+    7: day07,
+    8: day08,
+    9: day09,
+    10: day10,
+    13: day13,
+}
+
+# Largest accepted slope of log(runtime) over log(input size), per (day, task).
+BOUNDS = {
+    (1, 1): 1.5,
+    (1, 2): 1.5,
+    (2, 1): 1.5,
+    (2, 2): 1.5,
+    (3, 1): 1.5,
+    (3, 2): 1.5,
+    (5, 1): 1.5,
+    (5, 2): 1.5,
+    (6, 1): 1.5,
+    (6, 2): 1.7,
+    (7, 1): 1.5,
+    (7, 2): 1.5,
+    (8, 1): 2.3,
+    (8, 2): 2.3,
+    (9, 1): 1.5,
+    (9, 2): 1.5,
+    (10, 1): 1.5,
+    (10, 2): 1.5,
+    (13, 1): 1.5,
+    (13, 2): 1.5,
+}
+
+# Scales used by the self test, small enough to finish in seconds with the current solutions.
+TEST_SCALES: dict[tuple[int, int], list[float]] = {
+    (6, 2): [1, 2, 4],
+}
@@ -1,6 +1,14 @@
 import argparse
+import importlib
+import json
 import os.path
+import re
+import resource
 import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
 from datetime import date
 from urllib.error import URLError, HTTPError
 
@@ -107,6 +115,116 @@ def download(year: int, day: int, session: str):
     print(f"Done!")
 
 
+@dataclass
+class Measurement:
+    year: int
+    day: int
+    task: int
+    result: int | None
+    wall_time: float
+    cpu_time: float
+    peak_rss: int
+    error: str | None = None
+
+
+def discover(year: int, days: list[int] | None, tasks: list[int] | None) -> list[tuple[int, int]]:
+    year_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), f"year{year}")
+    if not os.path.exists(year_path):
+        print(f"Directory for year {year} doesn't exists.")
+        exit(1)
+
+    ret = []
+    for day_name in sorted(os.listdir(year_path)):
+        if (day_match := re.fullmatch(r"day(\d+)", day_name)) is None:
+            continue
+        day = int(day_match.group(1))
+        if days and day not in days:
+            continue
+        for task in (1, 2):
+            if tasks and task not in tasks:
+                continue
+            if os.path.exists(os.path.join(year_path, day_name, f"task{task}.py")):
+                ret.append((day, task))
+    return ret
+
+
+def peak_rss() -> int:
+    # note: ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if sys.platform == "darwin" else usage * 1024
+
+
+def run_task(year: int, day: int, task: int, example: bool) -> Measurement:
+    root = os.path.dirname(os.path.abspath(__file__))
+    if root not in sys.path:
+        sys.path.insert(0, root)
+    suffix = "_example" if example else ""
+    filename = os.path.join(root, f"year{year}", f"day{day:02}", f"task{task}{suffix}.txt")
+
+    # the import stays out of the measured time, only the task itself is timed
+    try:
+        module = importlib.import_module(f"year{year}.day{day:02}.task{task}")
+    except Exception as e:
+        return Measurement(year, day, task, None, 0.0, 0.0, peak_rss(), f"{type(e).__name__}: {e}")
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        result = module.task(filename)
+        error = None
+    except Exception as e:
+        result = None
+        error = f"{type(e).__name__}: {e}"
+    wall_time = time.perf_counter() - wall_start
+    cpu_time = time.process_time() - cpu_start
+
+    return Measurement(year, day, task, result, wall_time, cpu_time, peak_rss(), error)
+
+
+def run(year: int, days: list[int] | None, tasks: list[int] | None, jobs: int, example: bool, output: str):
+    selected = discover(year, days, tasks)
+    # note: every task gets a fresh process, so the peak RSS belongs to that task alone
+    with ProcessPoolExecutor(max_workers=jobs, max_tasks_per_child=1) as executor:
+        measurements = list(executor.map(
+            run_task,
+            [year] * len(selected),
+            [day for day, _ in selected],
+            [task for _, task in selected],
+            [example] * len(selected)
+        ))
+
+    match output:
+        case "json":
+            print(json.dumps([asdict(m) for m in measurements], indent=2))
+        case "table":
+            print(f"{'day':>5} {'task':>4} {'result':>20} {'wall [s]':>10} {'cpu [s]':>10} {'rss [MB]':>10}")
+            for m in measurements:
+                result = m.result if m.error is None else m.error.split(":", 1)[0]
+                print(f"{m.year % 100:02}.{m.day:02} {m.task:>4} {str(result):>20} {m.wall_time:>10.3f} {m.cpu_time:>10.3f} {m.peak_rss / 2 ** 20:>10.1f}")
+
+    if any(m.error is not None for m in measurements):
+        exit(1)
+
+
+def bench(year: int, days: list[int] | None, tasks: list[int] | None, scales: list[float], seed: int, output: str):
+    from benchmark.harness import generators, measure
+
+    selected = [(day, task) for day, task in discover(year, days, tasks) if day in generators(year)]
+    curves = [measure(year, day, task, scales, seed) for day, task in selected]
+
+    match output:
+        case "json":
+            print(json.dumps([asdict(c) | {"exponent": c.exponent} for c in curves], indent=2))
+        case "table":
+            print(f"{'day':>5} {'task':>4} {'exponent':>9} {'bound':>6}  seconds per scale")
+            for c in curves:
+                seconds = " ".join(f"{s.scale}x:{s.seconds:.3f}" for s in c.samples)
+                print(f"{c.year % 100:02}.{c.day:02} {c.task:>4} {c.exponent:>9.2f} {c.bound:>6.2f}  {seconds}")
+
+    if not all(c.within_bound for c in curves):
+        exit(1)
+
+
 def main():
     parser = argparse.ArgumentParser(
         prog='bootstrap',
@@ -115,7 +233,7 @@ def main():
     current_date = date.today()
 
     parser.add_argument('-y', '--year', type=int, default=current_date.year)
-    parser.add_argument('-d', '--day', type=int, required=True)
+    parser.add_argument('-d', '--day', type=int)
 
     subparsers = parser.add_subparsers(dest='command', required=True, help="Commands")
 
@@ -124,14 +242,32 @@ def main():
     parser_download.add_argument('-s', '--session', type=str, required=True)
     parser_full = subparsers.add_parser("full", help="Perform all commands for an AoC challenge")
     parser_full.add_argument('-s', '--session', type=str, required=True)
+    parser_run = subparsers.add_parser("run", help="Run AoC challenge solutions and measure them")
+    parser_run.add_argument('-t', '--task', type=int, choices=[1, 2], action='append')
+    parser_run.add_argument('-j', '--jobs', type=int, default=1)
+    parser_run.add_argument('-e', '--example', action='store_true')
+    parser_run.add_argument('-o', '--output', choices=["table", "json"], default="table")
+
+    parser_bench = subparsers.add_parser("bench", help="Measure how AoC challenge solutions scale on generated inputs")
+    parser_bench.add_argument('-t', '--task', type=int, choices=[1, 2], action='append')
+    parser_bench.add_argument('--scales', type=float, nargs='+', default=[10, 100, 1000])
+    parser_bench.add_argument('--seed', type=int, default=0)
+    parser_bench.add_argument('-o', '--output', choices=["table", "json"], default="table")
 
     args = parser.parse_args()
 
+    if args.command not in ("run", "bench") and args.day is None:
+        parser.error(f"the following arguments are required for {args.command}: -d/--day")
+
     match args.command:
         case "generate":
             generate(args.year, args.day)
         case "download":
             download(args.year, args.day, args.session)
+        case "run":
+            run(args.year, [args.day] if args.day is not None else None, args.task, args.jobs, args.example, args.output)
+        case "bench":
+            bench(args.year, [args.day] if args.day is not None else None, args.task, args.scales, args.seed, args.output)
         case "full":
             generate(args.year, args.day)
             download(args.year, args.day, args.session)
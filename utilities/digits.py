@@ -0,0 +1,67 @@
+import unittest
+from bisect import bisect_right
+from random import Random
+
+# POWERS_OF_TEN[n] == 10 ** n, enough for anything that fits into 128 bits
+POWERS_OF_TEN = tuple(10 ** n for n in range(40))
+
+
+def digit_count(value: int) -> int:
+    # number of decimal digits of a non-negative value, 0 counts as one digit
+    if value >= POWERS_OF_TEN[-1]:
+        return len(str(value))
+    return max(1, bisect_right(POWERS_OF_TEN, value))
+
+
+def suffix_power(value: int) -> int:
+    # the power of ten value is shifted by when it is concatenated to the right of something
+    count = digit_count(value)
+    return POWERS_OF_TEN[count] if count < len(POWERS_OF_TEN) else 10 ** count
+
+
+def concat(left: int, right: int, power: int | None = None) -> int:
+    # int(str(left) + str(right)), power is suffix_power(right) when it is already known
+    return left * (power or suffix_power(right)) + right
+
+
+def split(value: int, suffix: int, power: int | None = None) -> int | None:
+    # the left operand x with concat(x, suffix) == value, None when value does not end in suffix
+    power = power or suffix_power(suffix)
+    return value // power if value % power == suffix else None
+
+
+class TestCases(unittest.TestCase):
+    def test_digit_count(self):
+        self.assertEqual(digit_count(0), 1)
+        self.assertEqual(digit_count(9), 1)
+        self.assertEqual(digit_count(10), 2)
+        self.assertEqual(digit_count(10 ** 39 - 1), 39)
+        self.assertEqual(digit_count(10 ** 39), 40)
+        self.assertEqual(digit_count(10 ** 60), 61)
+
+    def test_concat_matches_strings(self):
+        rng = Random(7)
+        for _ in range(2000):
+            left = rng.randrange(10 ** rng.randrange(1, 45))
+            right = rng.randrange(10 ** rng.randrange(1, 45))
+            expected = int(str(left) + str(right))
+            self.assertEqual(digit_count(right), len(str(right)))
+            self.assertEqual(concat(left, right), expected)
+            self.assertEqual(concat(left, right, suffix_power(right)), expected)
+            self.assertEqual(split(expected, right), left)
+
+    def test_split_matches_strings(self):
+        rng = Random(11)
+        for _ in range(2000):
+            value = rng.randrange(10 ** rng.randrange(1, 30))
+            suffix = rng.randrange(10 ** rng.randrange(1, 6))
+            text, suffix_text = str(value), str(suffix)
+            if len(text) > len(suffix_text) and text.endswith(suffix_text):
+                expected = int(text[:-len(suffix_text)])
+            elif text == suffix_text:
+                expected = 0
+            else:
+                expected = None
+            self.assertEqual(split(value, suffix), expected, (value, suffix))
+            if expected is not None:
+                self.assertEqual(concat(expected, suffix), value)
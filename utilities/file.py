@@ -1,26 +1,45 @@
 import os.path
+import sys
 import unittest
-import inspect
+from functools import cache
 
-def __caller_filename() -> str:
-    # note: we assume the caller is two levels lower in the stack, with the called function and this helper on top
-    _,filename,_,_,_,_ = inspect.stack()[2]
-    return filename
 
-def data_example_filename() -> str:
-    root, ext = os.path.splitext(__caller_filename())
-    _, tail = os.path.split(root)
-    return tail + "_example.txt"
+@cache
+def __module_root(module: str) -> str:
+    # absolute path of the module file without its extension, e.g. /.../year2024/day01/task1
+    spec = getattr(sys.modules[module], "__spec__", None)
+    if spec is not None and spec.origin is not None:
+        filename = spec.origin
+    else:
+        filename = sys.modules[module].__file__
+    root, ext = os.path.splitext(os.path.abspath(filename))
+    return root
 
-def data_filename() -> str:
-    root, ext = os.path.splitext(__caller_filename())
-    _, tail = os.path.split(root)
-    return tail + ".txt"
+
+def __caller_module(depth: int) -> str:
+    # note: only reads the globals of the calling frame, no source context is loaded
+    return sys._getframe(depth + 1).f_globals["__name__"]
+
+
+def data_example_filename(module: str | None = None) -> str:
+    return __module_root(module or __caller_module(1)) + "_example.txt"
+
+
+def data_filename(module: str | None = None) -> str:
+    return __module_root(module or __caller_module(1)) + ".txt"
 
 
 class TestCases(unittest.TestCase):
     def test_data_example_filename(self):
-        self.assertEqual("file_example.txt", data_example_filename())
+        filename = data_example_filename()
+        self.assertTrue(os.path.isabs(filename))
+        self.assertEqual("file_example.txt", os.path.basename(filename))
 
     def test_data_filename(self):
-        self.assertEqual("file.txt", data_filename())
\ No newline at end of file
+        filename = data_filename()
+        self.assertTrue(os.path.isabs(filename))
+        self.assertEqual("file.txt", os.path.basename(filename))
+
+    def test_data_filename_for_module(self):
+        self.assertEqual(data_filename(__name__), data_filename())
+        self.assertEqual(data_filename("unittest"), os.path.splitext(unittest.__file__)[0] + ".txt")
@@ -0,0 +1,139 @@
+import unittest
+from array import array
+from collections.abc import Generator, Iterable, Sequence
+from typing import Self
+
+# directions in clockwise order, so turning right is (direction + 1) % 4
+UP = 0
+RIGHT = 1
+DOWN = 2
+LEFT = 3
+
+
+class Grid:
+    # Cells are kept in a flat bytearray surrounded by a one cell wide border filled with a
+    # sentinel value, so walks can step without bounds checks and cells are addressed by a
+    # single integer index.
+    __slots__ = ("dim_x", "dim_y", "stride", "border", "cells", "offsets")
+
+    def __init__(self, rows: Sequence[Sequence[int]], border: int):
+        self.dim_x = len(rows[0])
+        self.dim_y = len(rows)
+        self.stride = self.dim_x + 2
+        self.border = border
+        self.cells = bytearray([border]) * (self.stride * (self.dim_y + 2))
+        for iy, row in enumerate(rows):
+            # a shorter or longer row would resize the buffer and shift everything after it
+            if len(row) != self.dim_x:
+                raise ValueError(f"row {iy} has {len(row)} cells, expected {self.dim_x}")
+            start = self.index(0, iy)
+            self.cells[start:start + self.dim_x] = bytes(row)
+        self.offsets = (-self.stride, 1, self.stride, -1)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str], border: int) -> Self:
+        return cls([line.encode() for line in lines], border)
+
+    def index(self, x: int, y: int) -> int:
+        return (y + 1) * self.stride + x + 1
+
+    def position(self, index: int) -> tuple[int, int]:
+        y, x = divmod(index, self.stride)
+        return x - 1, y - 1
+
+    def inside(self, index: int) -> bool:
+        return self.cells[index] != self.border
+
+    def indices(self) -> Generator[int]:
+        for iy in range(self.dim_y):
+            start = self.index(0, iy)
+            yield from range(start, start + self.dim_x)
+
+    def neighbors(self, index: int) -> tuple[int, int, int, int]:
+        up, right, down, left = self.offsets
+        return index + up, index + right, index + down, index + left
+
+    def row(self, iy: int) -> bytes:
+        start = self.index(0, iy)
+        return bytes(self.cells[start:start + self.dim_x])
+
+
+class DirectionSet:
+    # Set of (cell, direction) states packed as 4 bits per cell, meant to be reused across walks.
+    # Every byte carries the epoch it was last written in; bytes from an older epoch read as
+    # empty, so clear() is O(1) instead of wiping the whole bitset.
+    __slots__ = ("bits", "epochs", "epoch")
+
+    def __init__(self, size: int):
+        self.bits = bytearray((size + 1) // 2)
+        self.epochs = array('I', bytes(4 * len(self.bits)))
+        self.epoch = 1
+
+    def clear(self):
+        self.epoch += 1
+        if self.epoch == 2 ** 32:
+            self.epochs = array('I', bytes(4 * len(self.bits)))
+            self.epoch = 1
+
+    def add(self, index: int, direction: int) -> bool:
+        # returns False when the state was already present
+        slot = index >> 1
+        if self.epochs[slot] != self.epoch:
+            self.epochs[slot] = self.epoch
+            self.bits[slot] = 0
+        bit = 1 << (direction + ((index & 1) << 2))
+        if self.bits[slot] & bit:
+            return False
+        self.bits[slot] |= bit
+        return True
+
+    def __contains__(self, state: tuple[int, int]) -> bool:
+        index, direction = state
+        slot = index >> 1
+        if self.epochs[slot] != self.epoch:
+            return False
+        return self.bits[slot] & (1 << (direction + ((index & 1) << 2))) != 0
+
+
+class TestCases(unittest.TestCase):
+    def test_construction(self):
+        grid = Grid.from_lines(["ab", "cd", "ef"], 0)
+        self.assertEqual(grid.dim_x, 2)
+        self.assertEqual(grid.dim_y, 3)
+        self.assertEqual(grid.cells[grid.index(1, 2)], ord("f"))
+        self.assertEqual(grid.position(grid.index(1, 2)), (1, 2))
+        self.assertEqual(grid.row(1), b"cd")
+        self.assertEqual([grid.cells[i] for i in grid.indices()], list(b"abcdef"))
+
+    def test_ragged_rows(self):
+        self.assertRaises(ValueError, Grid.from_lines, ["abc", "de", "fgh"], 0)
+        self.assertRaises(ValueError, Grid.from_lines, ["abc", "defg"], 0)
+
+    def test_border(self):
+        grid = Grid([[1, 2], [3, 4]], 0xFF)
+        corner = grid.index(0, 0)
+        self.assertTrue(grid.inside(corner))
+        self.assertFalse(grid.inside(corner + grid.offsets[UP]))
+        self.assertFalse(grid.inside(corner + grid.offsets[LEFT]))
+        self.assertEqual(
+            [grid.cells[i] for i in grid.neighbors(corner)],
+            [0xFF, 2, 3, 0xFF]
+        )
+        self.assertEqual(grid.neighbors(corner)[(UP + 1) % 4], corner + grid.offsets[RIGHT])
+
+    def test_direction_set(self):
+        states = DirectionSet(5)
+        self.assertTrue(states.add(3, UP))
+        self.assertTrue(states.add(3, LEFT))
+        self.assertTrue(states.add(2, UP))
+        self.assertTrue(states.add(4, DOWN))
+        self.assertFalse(states.add(3, UP))
+        self.assertIn((3, LEFT), states)
+        self.assertNotIn((3, RIGHT), states)
+        self.assertNotIn((1, UP), states)
+
+        states.clear()
+        self.assertNotIn((3, UP), states)
+        self.assertNotIn((2, UP), states)
+        self.assertTrue(states.add(3, UP))
+        self.assertNotIn((2, UP), states)
@@ -1,7 +1,71 @@
-from collections.abc import Generator, Callable, Iterator
+import mmap
+import os.path
+import re
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from collections.abc import Generator, Callable, Iterable, Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from typing import Self, TextIO
 
+type Buffer = bytes | mmap.mmap
+
+
+@contextmanager
+def map_file(filename: str) -> Generator[Buffer]:
+    # note: empty files can't be mapped, so we hand out an empty buffer instead
+    with open(filename, 'rb') as fp:
+        try:
+            mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            yield b""
+            return
+        with mapped:
+            yield mapped
+
+
+def line_spans(buffer: Buffer, begin: int = 0, end: int | None = None) -> Generator[tuple[int, int]]:
+    # yields (begin, end) offsets of every line in buffer[begin:end], newline included
+    if end is None:
+        end = len(buffer)
+    while begin < end:
+        newline = buffer.find(b"\n", begin, end)
+        line_end = end if newline == -1 else newline + 1
+        yield begin, line_end
+        begin = line_end
+
+
+def chunk_spans(buffer: Buffer, count: int) -> list[tuple[int, int]]:
+    # splits the buffer into (at most) count ranges, each ending right after a newline
+    size = len(buffer)
+    step = max(1, size // max(1, count))
+    spans = []
+    begin = 0
+    while begin < size:
+        end = begin + step
+        if end < size:
+            newline = buffer.find(b"\n", end - 1)
+            end = size if newline == -1 else newline + 1
+        else:
+            end = size
+        spans.append((begin, end))
+        begin = end
+    return spans
+
+
+def decode_line(buffer: Buffer, begin: int, end: int) -> str:
+    # like text mode reads, a \r\n line ending is handed out as \n
+    if end - begin >= 2 and buffer[end - 2:end] == b"\r\n":
+        return buffer[begin:end - 2].decode() + "\n"
+    return buffer[begin:end].decode()
+
+
+def read_lines(filename: str) -> Generator[str]:
+    with map_file(filename) as buffer:
+        for begin, end in line_spans(buffer):
+            yield decode_line(buffer, begin, end)
+
 
 @dataclass
 class LineStream:
@@ -15,10 +79,13 @@ class LineStream:
 
     @classmethod
     def from_text_file(cls, input: TextIO) -> Self:
-        return cls(input.readlines())
+        return cls(input)
 
+    @classmethod
+    def from_file(cls, filename: str) -> Self:
+        return cls(read_lines(filename))
 
-    def __init__(self, input: list[str]):
+    def __init__(self, input: Iterable[str]):
         self.iter = iter(input)
         self.inx = 0
 
@@ -31,20 +98,112 @@ class LineStream:
         return v
 
 
-def parse_lines[T](filename: str, line_parser: Callable[[int, str], T]) -> Generator[T]:
-    with open(filename, 'r') as fp:
-        i = 0
-        for line in fp.readlines():
-            yield line_parser(i, line)
-            i += 1
+def parse_lines[T](filename: str, line_parser: Callable[[int, str], T], workers: int | None = None) -> Generator[T]:
+    if workers is not None and workers > 1:
+        yield from parse_lines_parallel(filename, line_parser, workers)
+        return
+    for i, line in enumerate(read_lines(filename)):
+        yield line_parser(i, line)
+
+
+def parse_lines_parallel[T](filename: str, line_parser: Callable[[int, str], T], workers: int) -> Generator[T]:
+    # note: line_parser is sent to the worker processes, so it has to be a module level function
+    with map_file(filename) as buffer:
+        spans = chunk_spans(buffer, workers * 4)
+        first_lines = []
+        line_count = 0
+        for begin, end in spans:
+            first_lines.append(line_count)
+            line_count += buffer[begin:end].count(b"\n")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunks = executor.map(
+            _parse_chunk,
+            [filename] * len(spans),
+            spans,
+            first_lines,
+            [line_parser] * len(spans)
+        )
+        for chunk in chunks:
+            yield from chunk
+
+
+def _parse_chunk[T](filename: str, span: tuple[int, int], first_line: int, line_parser: Callable[[int, str], T]) -> list[T]:
+    ret = []
+    with map_file(filename) as buffer:
+        for i, (begin, end) in enumerate(line_spans(buffer, *span), start=first_line):
+            ret.append(line_parser(i, decode_line(buffer, begin, end)))
+    return ret
+
+
+def parse_records[T](filename: str, pattern: re.Pattern[bytes], record_parser: Callable[[re.Match[bytes]], T]) -> Generator[T]:
+    # one regex pass over the mapped file, every match is turned into a record lazily
+    with map_file(filename) as buffer:
+        for match in pattern.finditer(buffer):
+            yield record_parser(match)
 
 
 def parse[T](filename: str, parser: Callable[[LineStream,], T]) -> Generator[T]:
-    with open(filename, 'r') as fp:
-        stream = LineStream.from_text_file(fp)
-        while True:
-            try:
-                yield parser(stream)
-            except StopIteration:
-                break
+    stream = LineStream.from_file(filename)
+    while True:
+        try:
+            yield parser(stream)
+        except StopIteration:
+            break
+
+
+def _numbered_line(num: int, line: str) -> tuple[int, int]:
+    return num, int(line)
+
+
+def _numbered_text(num: int, line: str) -> tuple[int, str]:
+    return num, line
+
+
+class TestCases(unittest.TestCase):
+    def test_line_spans(self):
+        buffer = b"ab\n\ncde\nf"
+        self.assertEqual(list(line_spans(buffer)), [(0, 3), (3, 4), (4, 8), (8, 9)])
+        self.assertEqual(list(line_spans(buffer, 3, 8)), [(3, 4), (4, 8)])
+        self.assertEqual(list(line_spans(b"")), [])
+
+    def test_chunk_spans(self):
+        buffer = b"ab\n\ncde\nf"
+        self.assertEqual(chunk_spans(buffer, 1), [(0, 9)])
+        self.assertEqual(chunk_spans(buffer, 3), [(0, 3), (3, 8), (8, 9)])
+        self.assertEqual(chunk_spans(b"abc\n", 8), [(0, 4)])
+        self.assertEqual(chunk_spans(b"", 4), [])
+
+    def test_parse_lines_parallel(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "input.txt")
+            with open(filename, "w") as fp:
+                fp.write("".join(f"{i * 7}\n" for i in range(1000)))
+            expected = list(parse_lines(filename, _numbered_line))
+            self.assertEqual(len(expected), 1000)
+            self.assertEqual(list(parse_lines(filename, _numbered_line, workers=3)), expected)
+
+    def test_crlf_line_endings(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "input.txt")
+            with open(filename, "wb") as fp:
+                fp.write(b"a\r\nb\n\r\nc\r\n" * 50)
+            expected = ["a\n", "b\n", "\n", "c\n"] * 50
+            self.assertEqual(list(read_lines(filename)), expected)
+            self.assertEqual(list(parse_lines(filename, _numbered_text, workers=3)), list(enumerate(expected)))
+
+    def test_parse_records(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "input.txt")
+            with open(filename, "w") as fp:
+                fp.write("a=1, b=2\n\na=3,\nb=4\n")
+            pattern = re.compile(rb"a=(\d+),\s*b=(\d+)")
+            records = parse_records(filename, pattern, lambda m: (int(m.group(1)), int(m.group(2))))
+            self.assertEqual(list(records), [(1, 2), (3, 4)])
 
+    def test_line_stream(self):
+        stream = LineStream.from_string("a\nb\n")
+        self.assertEqual(next(stream), "a")
+        self.assertEqual(next(stream), "b")
+        self.assertEqual(stream.inx, 2)
+        self.assertRaises(StopIteration, lambda: next(stream))
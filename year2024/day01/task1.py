@@ -1,8 +1,13 @@
 import unittest
 from dataclasses import dataclass
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from utilities.file import data_example_filename, data_filename
-from utilities.parse import parse_lines
+from utilities.parse import map_file, parse_lines
 
 
 @dataclass
@@ -19,7 +24,34 @@ def load_line(num: int, line: str) -> LineModel:
     return Line(int(values[0]), int(values[1]))
 
 
+def load_lists(filename: str) -> tuple[list[int], list[int]]:
+    # both columns at once: every whitespace separated token of the file alternates left, right
+    with map_file(filename) as buffer:
+        values = [int(v) for v in buffer[:].split()]
+    return values[0::2], values[1::2]
+
+
+def load_arrays(filename: str) -> tuple["numpy.ndarray", "numpy.ndarray"]:
+    with map_file(filename) as buffer:
+        values = numpy.fromstring(buffer[:], dtype=numpy.int64, sep=" ").reshape(-1, 2)
+    return values[:, 0], values[:, 1]
+
+
+def distance(left: list[int], right: list[int]) -> int:
+    return sum(abs(l - r) for l, r in zip(sorted(left), sorted(right)))
+
+
+def distance_arrays(left: "numpy.ndarray", right: "numpy.ndarray") -> int:
+    return int(numpy.abs(numpy.sort(left) - numpy.sort(right)).sum())
+
+
 def task(filename: str) -> int:
+    if numpy is not None:
+        return distance_arrays(*load_arrays(filename))
+    return distance(*load_lists(filename))
+
+
+def task_lines(filename: str) -> int:
     ret = 0
     lines = parse_lines(filename, load_line)
     left = []
@@ -40,6 +72,22 @@ class TestCases(unittest.TestCase):
     def test_load_line(self):
         self.assertEqual(load_line(0, "3   4"), Line(3, 4))
 
+    def test_load_lists(self):
+        self.assertEqual(load_lists(data_example_filename()), ([3, 4, 2, 1, 3, 3], [4, 3, 5, 3, 9, 3]))
+
+    def test_distance(self):
+        self.assertEqual(distance([3, 4, 2, 1, 3, 3], [4, 3, 5, 3, 9, 3]), 11)
+        self.assertEqual(distance([], []), 0)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_distance_arrays(self):
+        left, right = load_arrays(data_filename())
+        self.assertEqual(distance_arrays(left, right), distance(*load_lists(data_filename())))
+        self.assertEqual(distance_arrays(numpy.array([], dtype=numpy.int64), numpy.array([], dtype=numpy.int64)), 0)
+
+    def test_task_lines(self):
+        self.assertEqual(task_lines(data_filename()), task(data_filename()))
+
     def test_example(self):
         self.assertEqual(task(data_example_filename()), 11)
 
@@ -1,8 +1,14 @@
 import unittest
+from collections import Counter
 from dataclasses import dataclass
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from utilities.file import data_example_filename, data_filename
-from utilities.parse import parse_lines
+from utilities.parse import map_file, parse_lines
 
 
 @dataclass
@@ -19,7 +25,41 @@ def load_line(num: int, line: str) -> LineModel:
     return Line(int(values[0]), int(values[1]))
 
 
+def load_lists(filename: str) -> tuple[list[int], list[int]]:
+    # both columns at once: every whitespace separated token of the file alternates left, right
+    with map_file(filename) as buffer:
+        values = [int(v) for v in buffer[:].split()]
+    return values[0::2], values[1::2]
+
+
+def load_arrays(filename: str) -> tuple["numpy.ndarray", "numpy.ndarray"]:
+    with map_file(filename) as buffer:
+        values = numpy.fromstring(buffer[:], dtype=numpy.int64, sep=" ").reshape(-1, 2)
+    return values[:, 0], values[:, 1]
+
+
+def similarity(left: list[int], right: list[int]) -> int:
+    histogram = Counter(right)
+    return sum(v * histogram[v] for v in left)
+
+
+def similarity_arrays(left: "numpy.ndarray", right: "numpy.ndarray") -> int:
+    # look every left value up in the sorted distinct right values, misses count zero times
+    values, counts = numpy.unique(right, return_counts=True)
+    if len(values) == 0:
+        return 0
+    positions = numpy.minimum(numpy.searchsorted(values, left), len(values) - 1)
+    found = values[positions] == left
+    return int((left * counts[positions])[found].sum())
+
+
 def task(filename: str) -> int:
+    if numpy is not None:
+        return similarity_arrays(*load_arrays(filename))
+    return similarity(*load_lists(filename))
+
+
+def task_lines(filename: str) -> int:
     ret = 0
     lines = parse_lines(filename, load_line)
     left = []
@@ -38,6 +78,23 @@ class TestCases(unittest.TestCase):
     def test_load_line(self):
         self.assertEqual(load_line(0, "3   4"), Line(3, 4))
 
+    def test_load_lists(self):
+        self.assertEqual(load_lists(data_example_filename()), ([3, 4, 2, 1, 3, 3], [4, 3, 5, 3, 9, 3]))
+
+    def test_similarity(self):
+        self.assertEqual(similarity([3, 4, 2, 1, 3, 3], [4, 3, 5, 3, 9, 3]), 31)
+        self.assertEqual(similarity([1, 2], []), 0)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_similarity_arrays(self):
+        left, right = load_arrays(data_filename())
+        self.assertEqual(similarity_arrays(left, right), similarity(*load_lists(data_filename())))
+        self.assertEqual(similarity_arrays(numpy.array([1, 9, 10]), numpy.array([9, 9, 2])), 18)
+        self.assertEqual(similarity_arrays(numpy.array([1, 2]), numpy.array([], dtype=numpy.int64)), 0)
+
+    def test_task_lines(self):
+        self.assertEqual(task_lines(data_filename()), task(data_filename()))
+
     def test_example(self):
         self.assertEqual(task(data_example_filename()), 31)
 
@@ -1,11 +1,25 @@
 import unittest
 from dataclasses import dataclass
+from random import Random
 from typing import Self
 
 from utilities.file import data_example_filename, data_filename
 from utilities.parse import parse_lines
 
 
+def first_violation(values: list[int], sign: int, skip: int = -1) -> int:
+    # index i of the first level that doesn't step 1 to 3 in direction sign from the level before it,
+    # values[skip] is treated as removed; -1 when the whole report is fine
+    prev = None
+    for i, v in enumerate(values):
+        if i == skip:
+            continue
+        if prev is not None and not 1 <= sign * (v - prev) <= 3:
+            return i
+        prev = v
+    return -1
+
+
 @dataclass
 class Report:
     values: list[int]
@@ -50,6 +64,18 @@ class Report:
 
     @property
     def is_safe(self) -> bool:
+        # every pair is checked on its own once the direction is fixed, so if the first bad pair
+        # is (i - 1, i) only removing one of those two levels can help
+        for sign in (1, -1):
+            bad = first_violation(self.values, sign)
+            if bad == -1:
+                return True
+            if first_violation(self.values, sign, bad - 1) == -1 or first_violation(self.values, sign, bad) == -1:
+                return True
+        return False
+
+    @property
+    def is_safe_removing(self) -> bool:
         if self.is_safe_direct:
             return True
         for i in range(len(self.values)):
@@ -85,6 +111,21 @@ class TestCases(unittest.TestCase):
         self.assertFalse(Report([9, 7, 6, 2, 1]).is_safe)
         self.assertTrue(Report([1, 3, 2, 4, 5]).is_safe)
         self.assertTrue(Report([8, 6, 4, 4, 1]).is_safe)
+        self.assertTrue(Report([5, 1, 2, 3]).is_safe)
+        self.assertTrue(Report([1, 2, 3, 9]).is_safe)
+        self.assertTrue(Report([3, 1, 2, 3, 4]).is_safe)
+        self.assertTrue(Report([1]).is_safe)
+        self.assertTrue(Report([]).is_safe)
+
+    def test_is_safe_matches_removing(self):
+        rng = Random(2)
+        for _ in range(5000):
+            start = rng.randrange(1, 50)
+            values = [start]
+            for _ in range(rng.randrange(0, 9)):
+                values.append(values[-1] + rng.choice([-5, -3, -2, -1, 0, 1, 2, 3, 4]))
+            report = Report(values)
+            self.assertEqual(report.is_safe, report.is_safe_removing, values)
 
     def test_example(self):
         self.assertEqual(task(data_example_filename()), 4)
@@ -1,10 +1,14 @@
+import io
+import re
 import unittest
+from random import Random
+from collections.abc import Generator
 from dataclasses import dataclass
 from enum import IntEnum, auto
-from typing import Self
+from typing import Self, BinaryIO
 
 from utilities.file import data_example_filename, data_filename
-from utilities.parse import parse_lines
+from utilities.parse import Buffer
 
 
 @dataclass(frozen=True)
@@ -16,61 +20,48 @@ class Operation:
         return self.x * self.y
 
 
-@dataclass(frozen=True)
-class Row:
-    operations: list[Operation]
+# mul(x,y) with 1-3 digit operands
+PATTERN = r"mul\(([0-9]{1,3}),([0-9]{1,3})\)"
+TEXT_SCANNER = re.compile(PATTERN)
+BYTES_SCANNER = re.compile(PATTERN.encode())
+MAX_TOKEN_LEN = len("mul(123,123)")
 
-    @classmethod
-    def parse(cls, line: str) -> Self:
-        i = 0
-        operations = []
 
-        while i < len(line):
-            if (op := cls.parse_operation(line, i)) is not None:
-                operations.append(op)
-            i += 1
+def scan(memory: str | Buffer) -> Generator[Operation]:
+    scanner = TEXT_SCANNER if isinstance(memory, str) else BYTES_SCANNER
+    for match in scanner.finditer(memory):
+        yield Operation(int(match.group(1)), int(match.group(2)))
 
-        return cls(operations)
 
-    @classmethod
-    def parse_operation(cls, line: str, start_index: int) -> Operation | None:
-        i = start_index
-        if line[i] != "m" or line[i + 1] != "u" or line[i + 2] != "l" or line[i + 3] != "(":
-            return None
-        i += 4
-        x = 0
-        ix = 0
-        while ix <= 3:
-            ch = line[i + ix]
-            if ch == ',':
-                break
-            elif str.isdigit(ch):
-                x = x * 10 + int(ch)
-                ix += 1
-            else:
-                return None
-
-        if ix > 3 or line[i+ix] != ',':
-            return None
-
-        i = i + ix + 1
-
-        y = 0
-        iy = 0
-        while iy <= 3:
-            ch = line[i + iy]
-            if ch == ')':
+def evaluate(fp: BinaryIO, chunk_size: int = 1 << 20) -> int:
+    # reads fixed size chunks and keeps only the running sum and the tail of the
+    # previous chunk that may hold the beginning of a token
+    ret = 0
+    tail = b""
+    while True:
+        chunk = fp.read(chunk_size)
+        memory = tail + chunk
+        # a token starting before safe_end lies completely in memory
+        safe_end = len(memory) if not chunk else len(memory) - MAX_TOKEN_LEN + 1
+        processed = 0
+        for match in BYTES_SCANNER.finditer(memory):
+            if match.start() >= safe_end:
                 break
-            elif str.isdigit(ch):
-                y = y * 10 + int(ch)
-                iy += 1
-            else:
-                return None
+            ret += int(match.group(1)) * int(match.group(2))
+            processed = match.end()
+        if not chunk:
+            return ret
+        tail = memory[max(safe_end, processed, 0):]
 
-        if iy > 3 or line[i+iy] != ')':
-            return None
 
-        return Operation(x, y)
+@dataclass(frozen=True)
+class Row:
+    operations: list[Operation]
+
+    @classmethod
+    def parse(cls, line: str) -> Self:
+        return cls(list(scan(line)))
+
 
 type LineModel = Row
 
@@ -80,12 +71,8 @@ def load_line(num: int, line: str) -> LineModel:
 
 
 def task(filename: str) -> int:
-    ret = 0
-    lines = parse_lines(filename, load_line)
-    for line in lines:
-        for op in line.operations:
-            ret += op.value()
-    return ret
+    with open(filename, 'rb') as fp:
+        return evaluate(fp)
 
 
 class TestCases(unittest.TestCase):
@@ -103,6 +90,15 @@ class TestCases(unittest.TestCase):
         self.assertEqual(load_line(0, "abcmul(2,5)123"), Row([Operation(2, 5)]))
         self.assertEqual(load_line(0, "abcmul(2,5)123mul(34,21)"), Row([Operation(2, 5), Operation(34, 21)]))
 
+    def test_evaluate(self):
+        rng = Random(3)
+        pieces = ["mul(", "12", "3", ",", "45", ")", "mul(7,8)", "x", "\n", "("]
+        for _ in range(100):
+            memory = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 60)))
+            expected = sum(op.value() for op in Row.parse(memory).operations)
+            for chunk_size in (1, 2, 5, 11, 64):
+                self.assertEqual(evaluate(io.BytesIO(memory.encode()), chunk_size), expected, (memory, chunk_size))
+
     def test_example(self):
         self.assertEqual(task(data_example_filename()), 161)
 
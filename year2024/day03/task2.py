@@ -1,10 +1,14 @@
+import io
+import re
 import unittest
+from random import Random
+from collections.abc import Generator
 from dataclasses import dataclass
 from enum import IntEnum, auto
-from typing import Self
+from typing import Self, BinaryIO
 
 from utilities.file import data_example_filename, data_filename
-from utilities.parse import parse_lines
+from utilities.parse import Buffer
 
 
 class OpCode(IntEnum):
@@ -23,98 +27,61 @@ class Operation:
         return self.x * self.y
 
 
-@dataclass(frozen=True)
-class Row:
-    operations: list[Operation]
+# mul(x,y) with 1-3 digit operands, do() and don't(); the alternative that matched is told apart by lastindex
+PATTERN = r"mul\(([0-9]{1,3}),([0-9]{1,3})\)|(do)\(\)|(don't)\(\)"
+TEXT_SCANNER = re.compile(PATTERN)
+BYTES_SCANNER = re.compile(PATTERN.encode())
+MAX_TOKEN_LEN = len("mul(123,123)")
 
-    @classmethod
-    def parse(cls, line: str) -> Self:
-        i = 0
-        operations = []
-
-        while i < len(line):
-            if (op := cls.parse_operation(line, i)) is not None:
-                operations.append(op)
-            i += 1
 
-        return cls(operations)
+def scan(memory: str | Buffer) -> Generator[Operation]:
+    scanner = TEXT_SCANNER if isinstance(memory, str) else BYTES_SCANNER
+    for match in scanner.finditer(memory):
+        match match.lastindex:
+            case 2:
+                yield Operation(OpCode.MUL, int(match.group(1)), int(match.group(2)))
+            case 3:
+                yield Operation(OpCode.DO, 0, 0)
+            case 4:
+                yield Operation(OpCode.DO_NOT, 0, 0)
 
-    @classmethod
-    def parse_operation(cls, line: str, start_index: int) -> Operation | None:
-        if (op := cls.parse_mul_operation(line, start_index)) is not None:
-            return op
-        if (op := cls.parse_do_operation(line, start_index)) is not None:
-            return op
-        if (op := cls.parse_do_not_operation(line, start_index)) is not None:
-            return op
-        return None
 
-    @classmethod
-    def parse_mul_operation(cls, line: str, start_index: int) -> Operation | None:
-        i = start_index
-        if line[i] != "m" or line[i + 1] != "u" or line[i + 2] != "l" or line[i + 3] != "(":
-            return None
-        i += 4
-        x = 0
-        ix = 0
-        while ix <= 3:
-            ch = line[i + ix]
-            if ch == ',':
-                break
-            elif str.isdigit(ch):
-                x = x * 10 + int(ch)
-                ix += 1
-            else:
-                return None
-
-        if ix > 3 or line[i + ix] != ',':
-            return None
-
-        i = i + ix + 1
-
-        y = 0
-        iy = 0
-        while iy <= 3:
-            ch = line[i + iy]
-            if ch == ')':
+def evaluate(fp: BinaryIO, chunk_size: int = 1 << 20) -> int:
+    # reads fixed size chunks and keeps only the running sum, the enabled flag and
+    # the tail of the previous chunk that may hold the beginning of a token
+    ret = 0
+    enabled = True
+    tail = b""
+    while True:
+        chunk = fp.read(chunk_size)
+        memory = tail + chunk
+        # a token starting before safe_end lies completely in memory
+        safe_end = len(memory) if not chunk else len(memory) - MAX_TOKEN_LEN + 1
+        processed = 0
+        for match in BYTES_SCANNER.finditer(memory):
+            if match.start() >= safe_end:
                 break
-            elif str.isdigit(ch):
-                y = y * 10 + int(ch)
-                iy += 1
-            else:
-                return None
-
-        if iy > 3 or line[i + iy] != ')':
-            return None
+            match match.lastindex:
+                case 2:
+                    if enabled:
+                        ret += int(match.group(1)) * int(match.group(2))
+                case 3:
+                    enabled = True
+                case 4:
+                    enabled = False
+            processed = match.end()
+        if not chunk:
+            return ret
+        tail = memory[max(safe_end, processed, 0):]
 
-        return Operation(OpCode.MUL, x, y)
 
-    @classmethod
-    def parse_do_operation(cls, line: str, start_index: int) -> Operation | None:
-        i = start_index
-        if (
-                line[i + 0] != "d" or
-                line[i + 1] != "o" or
-                line[i + 2] != "(" or
-                line[i + 3] != ")"
-        ):
-            return None
-        return Operation(OpCode.DO, 0, 0)
+@dataclass(frozen=True)
+class Row:
+    operations: list[Operation]
 
     @classmethod
-    def parse_do_not_operation(cls, line: str, start_index: int) -> Operation | None:
-        i = start_index
-        if (
-                line[i + 0] != "d" or
-                line[i + 1] != "o" or
-                line[i + 2] != "n" or
-                line[i + 3] != "'" or
-                line[i + 4] != "t" or
-                line[i + 5] != "(" or
-                line[i + 6] != ")"
-        ):
-            return None
-        return Operation(OpCode.DO_NOT, 0, 0)
+    def parse(cls, line: str) -> Self:
+        return cls(list(scan(line)))
 
 
 type LineModel = Row
@@ -125,21 +92,8 @@ def load_line(num: int, line: str) -> LineModel:
 
 
 def task(filename: str) -> int:
-    ret = 0
-    lines = parse_lines(filename, load_line)
-    enabled = True
-    for line in lines:
-        for op in line.operations:
-            match op.op:
-                case OpCode.MUL:
-                    if enabled:
-                        ret += op.value()
-                case OpCode.DO:
-                    enabled = True
-                case OpCode.DO_NOT:
-                    enabled = False
-
-    return ret
+    with open(filename, 'rb') as fp:
+        return evaluate(fp)
 
 
 class TestCases(unittest.TestCase):
@@ -163,6 +117,39 @@ class TestCases(unittest.TestCase):
         self.assertEqual(load_line(0, "don't()"), Row([Operation(OpCode.DO_NOT, 0, 0)]))
         self.assertEqual(load_line(0, "don't( )"), Row([]))
 
+    def test_scan(self):
+        self.assertEqual(
+            list(scan(b"xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))")),
+            [
+                Operation(OpCode.MUL, 2, 4),
+                Operation(OpCode.DO_NOT, 0, 0),
+                Operation(OpCode.MUL, 5, 5),
+                Operation(OpCode.MUL, 11, 8),
+                Operation(OpCode.DO, 0, 0),
+                Operation(OpCode.MUL, 8, 5),
+            ]
+        )
+        self.assertEqual(list(scan("mul(1,2)\ndo()")), list(scan(b"mul(1,2)\ndo()")))
+
+    def test_evaluate(self):
+        rng = Random(3)
+        pieces = ["mul(", "12", "3", ",", "45", ")", "do()", "don't()", "mul(7,8)", "x", "\n", "(", "do", "n't"]
+        for _ in range(100):
+            memory = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 60)))
+            expected = 0
+            enabled = True
+            for op in Row.parse(memory).operations:
+                match op.op:
+                    case OpCode.MUL:
+                        if enabled:
+                            expected += op.value()
+                    case OpCode.DO:
+                        enabled = True
+                    case OpCode.DO_NOT:
+                        enabled = False
+            for chunk_size in (1, 2, 5, 11, 64):
+                self.assertEqual(evaluate(io.BytesIO(memory.encode()), chunk_size), expected, (memory, chunk_size))
+
     def test_example(self):
         self.assertEqual(task(data_example_filename()), 48)
 
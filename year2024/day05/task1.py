@@ -19,6 +19,52 @@ class Rule:
         return cls(int(separated[0]), int(separated[1]))
 
 
+EMPTY: set[int] = set()
+
+
+class RuleIndex:
+    # rules compiled into the set of pages that have to come after each page, plus the same
+    # relation as bitmasks over dense page numbers for validating updates
+    def __init__(self, rules: list[Rule]):
+        self.after: dict[int, set[int]] = {}
+        self.dense: dict[int, int] = {}
+        for rule in rules:
+            self.after.setdefault(rule.left, set()).add(rule.right)
+            self.dense.setdefault(rule.left, len(self.dense))
+            self.dense.setdefault(rule.right, len(self.dense))
+
+        self.after_masks = [0] * len(self.dense)
+        for page, after in self.after.items():
+            mask = 0
+            for right in after:
+                mask |= 1 << self.dense[right]
+            self.after_masks[self.dense[page]] = mask
+
+    def pages_after(self, page: int) -> set[int]:
+        return self.after.get(page, EMPTY)
+
+    def verify(self, pages: list[int]) -> bool:
+        dense = self.dense
+        after_masks = self.after_masks
+        seen = 0
+        for page in pages:
+            # pages without rules can't break the order
+            if (i := dense.get(page)) is None:
+                continue
+            # none of the pages printed so far may be required after this one
+            if after_masks[i] & seen:
+                return False
+            seen |= 1 << i
+        return True
+
+    def partition(self, updates: list["Update"]) -> tuple[list["Update"], list["Update"]]:
+        valid = []
+        invalid = []
+        for update in updates:
+            (valid if self.verify(update.pages) else invalid).append(update)
+        return valid, invalid
+
+
 @dataclass
 class Update:
     pages: list[int]
@@ -35,16 +81,10 @@ class Update:
     def middle_value(self) -> int:
         return self.pages[len(self.pages) // 2]
 
-    def verify_against_rules(self, rules: list[Rule]) -> bool:
-        page_set = set(self.pages)
-        valid_rules = [r for r in rules if r.left in page_set and r.right in page_set]
-        for subject in range(len(self.pages) - 1):
-            for candidate in range(subject + 1, len(self.pages)):
-                for rule in valid_rules:
-                    if rule.left == self.pages[candidate] and rule.right == self.pages[subject]:
-                        return False
-
-        return True
+    def verify_against_rules(self, rules: RuleIndex | list[Rule]) -> bool:
+        if not isinstance(rules, RuleIndex):
+            rules = RuleIndex(rules)
+        return rules.verify(self.pages)
 
 
 # class Node:
@@ -100,9 +140,9 @@ def task(filename: str) -> int:
         if type(line) is Update:
             updates.append(line)
 
-    for update in updates:
-        if update.verify_against_rules(rules):
-            ret += update.middle_value
+    valid, _ = RuleIndex(rules).partition(updates)
+    for update in valid:
+        ret += update.middle_value
 
     return ret
 
@@ -117,6 +157,12 @@ class TestCases(unittest.TestCase):
         self.assertEqual(Update([75, 47, 61, 53, 29]).middle_value, 61)
         self.assertEqual(Update([75,29,13]).middle_value, 29)
 
+    def test_rule_index_partition(self):
+        index = RuleIndex([Rule(47, 53), Rule(97, 47)])
+        valid, invalid = index.partition([Update([97, 47, 53]), Update([53, 47]), Update([11, 97, 12, 53])])
+        self.assertEqual(valid, [Update([97, 47, 53]), Update([11, 97, 12, 53])])
+        self.assertEqual(invalid, [Update([53, 47])])
+
     def test_update_verify_against_rules(self):
         update = Update([75, 47, 61, 53, 29])
         self.assertTrue(update.verify_against_rules([Rule(47, 53)]))
@@ -1,6 +1,6 @@
 import unittest
 from dataclasses import dataclass, field
-from functools import cmp_to_key
+from heapq import heapify, heappop, heappush
 from typing import Self
 
 from utilities.file import data_example_filename, data_filename
@@ -20,6 +20,52 @@ class Rule:
         return cls(int(separated[0]), int(separated[1]))
 
 
+EMPTY: set[int] = set()
+
+
+class RuleIndex:
+    # rules compiled into the set of pages that have to come after each page, plus the same
+    # relation as bitmasks over dense page numbers for validating updates
+    def __init__(self, rules: list[Rule]):
+        self.after: dict[int, set[int]] = {}
+        self.dense: dict[int, int] = {}
+        for rule in rules:
+            self.after.setdefault(rule.left, set()).add(rule.right)
+            self.dense.setdefault(rule.left, len(self.dense))
+            self.dense.setdefault(rule.right, len(self.dense))
+
+        self.after_masks = [0] * len(self.dense)
+        for page, after in self.after.items():
+            mask = 0
+            for right in after:
+                mask |= 1 << self.dense[right]
+            self.after_masks[self.dense[page]] = mask
+
+    def pages_after(self, page: int) -> set[int]:
+        return self.after.get(page, EMPTY)
+
+    def verify(self, pages: list[int]) -> bool:
+        dense = self.dense
+        after_masks = self.after_masks
+        seen = 0
+        for page in pages:
+            # pages without rules can't break the order
+            if (i := dense.get(page)) is None:
+                continue
+            # none of the pages printed so far may be required after this one
+            if after_masks[i] & seen:
+                return False
+            seen |= 1 << i
+        return True
+
+    def partition(self, updates: list["Update"]) -> tuple[list["Update"], list["Update"]]:
+        valid = []
+        invalid = []
+        for update in updates:
+            (valid if self.verify(update.pages) else invalid).append(update)
+        return valid, invalid
+
+
 @dataclass
 class Update:
     pages: list[int]
@@ -36,28 +82,37 @@ class Update:
     def middle_value(self) -> int:
         return self.pages[len(self.pages) // 2]
 
-    def verify_against_rules(self, rules: list[Rule]) -> bool:
-        page_set = set(self.pages)
-        valid_rules = [r for r in rules if r.left in page_set and r.right in page_set]
-        for subject in range(len(self.pages) - 1):
-            for candidate in range(subject + 1, len(self.pages)):
-                for rule in valid_rules:
-                    if rule.left == self.pages[candidate] and rule.right == self.pages[subject]:
-                        return False
-
-        return True
-
-    def apply_rules(self, rules: list[Rule]) -> Self:
-        def compare(left: int, right: int) -> int:
-            for r in rules:
-                if r.left == left and r.right == right:
-                    return -1
-                elif r.left == right and r.right == left:
-                    return 1
-            return 0
-
-        sorted_pages = sorted(self.pages, key=cmp_to_key(compare))
+    def verify_against_rules(self, rules: RuleIndex | list[Rule]) -> bool:
+        if not isinstance(rules, RuleIndex):
+            rules = RuleIndex(rules)
+        return rules.verify(self.pages)
 
+    def apply_rules(self, rules: RuleIndex | list[Rule]) -> Self:
+        # Kahn's topological sort over the rules between the pages of this update,
+        # pages that are ready at the same time keep their original order
+        if not isinstance(rules, RuleIndex):
+            rules = RuleIndex(rules)
+        page_set = set(self.pages)
+        order = {page: i for i, page in enumerate(self.pages)}
+        edges = {page: rules.pages_after(page) & page_set for page in self.pages}
+        incoming = {page: 0 for page in self.pages}
+        for page in self.pages:
+            for after in edges[page]:
+                incoming[after] += 1
+
+        ready = [order[page] for page in self.pages if incoming[page] == 0]
+        heapify(ready)
+        sorted_pages = []
+        while ready:
+            page = self.pages[heappop(ready)]
+            sorted_pages.append(page)
+            for after in edges[page]:
+                incoming[after] -= 1
+                if incoming[after] == 0:
+                    heappush(ready, order[after])
+
+        # pages caught in a cycle of rules can't be ordered, keep them as they were
+        sorted_pages.extend(page for page in self.pages if incoming[page] > 0)
         return Update(sorted_pages)
 
 
@@ -84,10 +139,10 @@ def task(filename: str) -> int:
         if type(line) is Update:
             updates.append(line)
 
-    for update in updates:
-        if update.verify_against_rules(rules):
-            continue
-        improved_update = update.apply_rules(rules)
+    index = RuleIndex(rules)
+    _, invalid = index.partition(updates)
+    for update in invalid:
+        improved_update = update.apply_rules(index)
         ret += improved_update.middle_value
 
     return ret
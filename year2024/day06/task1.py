@@ -1,9 +1,9 @@
 import unittest
-from dataclasses import dataclass
 from enum import StrEnum
 from typing import Self
 
 from utilities.file import data_example_filename, data_filename
+from utilities.grid import Grid, UP, RIGHT, DOWN, LEFT
 from utilities.parse import parse_lines
 
 
@@ -32,85 +32,61 @@ class Field(StrEnum):
                 return Field.GUARD_UP
         exit(1)
 
-
-type LineModel = str
-
-
-@dataclass(frozen=True)
-class Position:
-    x: int
-    y: int
-
-    def move(self, field: Field) -> Self:
-        match field:
+    @property
+    def direction(self) -> int:
+        match self:
             case Field.GUARD_UP:
-                return Position(self.x, self.y - 1)
+                return UP
+            case Field.GUARD_RIGHT:
+                return RIGHT
             case Field.GUARD_DOWN:
-                return Position(self.x, self.y + 1)
+                return DOWN
             case Field.GUARD_LEFT:
-                return Position(self.x - 1, self.y)
-            case Field.GUARD_RIGHT:
-                return Position(self.x + 1, self.y)
+                return LEFT
+        exit(1)
+
+
+type LineModel = str
+
+BORDER = ord(' ')
 
 
 class Map:
     def __init__(self, input: list[str]):
-        fields = []
-        iy = 0
-        for line in input:
-            ix = 0
-            for char in line:
-                field = Field(char)
-                if field.is_guard:
-                    self.guard_position = Position(ix, iy)
-                    self.guard_direction = field
-                    fields.append(Field.EMPTY)
-                else:
-                    fields.append(field)
-                ix += 1
-            iy += 1
-        self.fields = fields
-        self.dim_x = len(input[0])
-        self.dim_y = len(input)
+        self.grid = Grid.from_lines(input, BORDER)
+        for field in (Field.GUARD_UP, Field.GUARD_DOWN, Field.GUARD_LEFT, Field.GUARD_RIGHT):
+            if (index := self.grid.cells.find(field.encode())) != -1:
+                self.guard_position = index
+                self.guard_direction = field.direction
+                self.grid.cells[index] = ord(Field.EMPTY)
+        self.dim_x = self.grid.dim_x
+        self.dim_y = self.grid.dim_y
 
     def walk(self) -> int:
-        ret = 1
-        visited: dict[Position, set[Field]] = {
-        }
+        cells = self.grid.cells
+        offsets = self.grid.offsets
+        crate = ord(Field.CRATE)
+        position = self.guard_position
+        direction = self.guard_direction
+        # bit per direction the guard faced on a cell
+        visited = bytearray(len(cells))
+        ret = 0
         while True:
-            next_position = self.guard_position.move(self.guard_direction)
-            if not self.guard(next_position):
-                break
-
-            next_field = self.get(next_position)
-            if next_field == Field.CRATE:
-                self.guard_direction = self.guard_direction.turn_right()
+            if visited[position] == 0:
+                ret += 1
+            elif visited[position] & (1 << direction):
+                # loop
+                return ret
+            visited[position] |= 1 << direction
+
+            next_position = position + offsets[direction]
+            next_field = cells[next_position]
+            if next_field == BORDER:
+                return ret
+            if next_field == crate:
+                direction = (direction + 1) % 4
             else:
-                if self.guard_position in visited:
-                    if self.guard_direction in visited[self.guard_position]:
-                        # loop
-                        return ret
-                    else:
-                        visited[self.guard_position].add(self.guard_direction)
-                else:
-                    ret += 1
-                    visited[self.guard_position] = {self.guard_direction}
-
-                self.guard_position = next_position
-        return ret
-
-    def get(self, position: Position) -> Field | None:
-        if not self.guard(position):
-            return None
-        return self.fields[position.y * self.dim_x + position.x]
-
-    def set(self, position: Position, field: Field):
-        if not self.guard(position):
-            return None
-        self.fields[position.y * self.dim_x + position.x] = field
-
-    def guard(self, position: Position) -> bool:
-        return 0 <= position.x < self.dim_x and 0 <= position.y < self.dim_y
+                position = next_position
 
 
 def load_line(num: int, line: str) -> LineModel:
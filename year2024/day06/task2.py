@@ -1,9 +1,12 @@
+import multiprocessing
 import unittest
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
 from enum import StrEnum
+from random import Random
 from typing import Self, Tuple
 
 from utilities.file import data_example_filename, data_filename
+from utilities.grid import Grid, DirectionSet, UP, RIGHT, DOWN, LEFT
 from utilities.parse import parse_lines
 
 
@@ -31,104 +34,163 @@ class Field(StrEnum):
                 return Field.GUARD_UP
         exit(1)
 
-
-@dataclass(frozen=True)
-class Position:
-    x: int
-    y: int
-
-    def move(self, field: Field) -> Self:
-        match field:
+    @property
+    def direction(self) -> int:
+        match self:
             case Field.GUARD_UP:
-                return Position(self.x, self.y - 1)
+                return UP
+            case Field.GUARD_RIGHT:
+                return RIGHT
             case Field.GUARD_DOWN:
-                return Position(self.x, self.y + 1)
+                return DOWN
             case Field.GUARD_LEFT:
-                return Position(self.x - 1, self.y)
-            case Field.GUARD_RIGHT:
-                return Position(self.x + 1, self.y)
+                return LEFT
+        exit(1)
+
 
+type State = tuple[int, int]
 
-type Path = dict[Position, set[Field]]
+BORDER = ord(' ')
 
 
 class Map:
     def __init__(self, input: list[str]):
-        fields = []
-        iy = 0
-        for line in input:
-            ix = 0
-            for char in line:
-                field = Field(char)
-                if field.is_guard:
-                    self.guard_position = Position(ix, iy)
-                    self.guard_direction = field
-                    fields.append(Field.EMPTY)
+        self.grid = Grid.from_lines(input, BORDER)
+        for field in (Field.GUARD_UP, Field.GUARD_DOWN, Field.GUARD_LEFT, Field.GUARD_RIGHT):
+            if (index := self.grid.cells.find(field.encode())) != -1:
+                self.guard_position = index
+                self.guard_direction = field.direction
+                self.grid.cells[index] = ord(Field.EMPTY)
+        self.dim_x = self.grid.dim_x
+        self.dim_y = self.grid.dim_y
+        self.jumps = self.build_jumps()
+        self.visited = DirectionSet(len(self.grid.cells))
+
+    def build_jumps(self) -> list[int]:
+        # for every (cell, direction) the first crate or border cell the guard runs into, at cell * 4 + direction
+        cells = self.grid.cells
+        crate = ord(Field.CRATE)
+        jumps = [0] * (len(cells) * 4)
+        indices = list(self.grid.indices())
+        for direction, offset in enumerate(self.grid.offsets):
+            # cells ahead have to be resolved first
+            for index in (reversed(indices) if offset > 0 else indices):
+                ahead = index + offset
+                if cells[ahead] == BORDER or cells[ahead] == crate:
+                    jumps[index * 4 + direction] = ahead
                 else:
-                    fields.append(field)
-                ix += 1
-            iy += 1
-        self.fields = fields
-        self.dim_x = len(input[0])
-        self.dim_y = len(input)
-
-    def walk(self) -> int:
-        obstacles: set[Position] = set()
+                    jumps[index * 4 + direction] = jumps[ahead * 4 + direction]
+        return jumps
+
+    def walk(self, workers: int | None = None) -> int:
         path, is_loop = self.walk_internal(self.guard_position, self.guard_direction, None)
         if is_loop:
             return 0
 
-        for position in path:
-            for direction in path[position]:
-                candidate_obstacle = position.move(direction)
-                if not self.guard(candidate_obstacle):
-                    continue
-                new_path, is_loop = self.walk_internal(position, direction, candidate_obstacle)
-                if is_loop:
-                    obstacles.add(position.move(direction))
+        offsets = self.grid.offsets
+        candidates = [(p, d) for p, d in path if self.grid.inside(p + offsets[d])]
+        if workers is not None and workers > 1:
+            obstacles = self.find_obstacles_parallel(candidates, workers)
+        else:
+            obstacles = self.find_obstacles(candidates)
 
         return len(obstacles)
 
-    def walk_internal(self, position: Position, direction: Field, additional_obstacle: Position | None) -> Tuple[Path, bool]:
-        path: Path = {}
+    def find_obstacles(self, candidates: list[State]) -> set[int]:
+        obstacles: set[int] = set()
+        offsets = self.grid.offsets
+        for position, direction in candidates:
+            candidate_obstacle = position + offsets[direction]
+            if self.is_loop(position, direction, candidate_obstacle):
+                obstacles.add(candidate_obstacle)
+        return obstacles
+
+    def find_obstacles_parallel(self, candidates: list[State], workers: int) -> set[int]:
+        # with fork the workers inherit the map read-only, otherwise it is sent once per worker
+        global _shared_map
+        _shared_map = self
+        if "fork" in multiprocessing.get_all_start_methods():
+            context, initargs = multiprocessing.get_context("fork"), (None,)
+        else:
+            context, initargs = None, (self,)
+
+        # strided batches spread the long and short walks evenly
+        batch_count = workers * 4
+        batches = [candidates[i::batch_count] for i in range(batch_count)]
+        obstacles: set[int] = set()
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_share_map, initargs=initargs) as executor:
+            for found in executor.map(_find_obstacles, batches):
+                obstacles |= found
+        return obstacles
+
+    def is_loop(self, position: int, direction: int, additional_obstacle: int) -> bool:
+        # moves from turn to turn using the jump table, the additional obstacle only shortens
+        # jumps along its own row and column
+        cells = self.grid.cells
+        offsets = self.grid.offsets
+        jumps = self.jumps
+        obstacle_row, obstacle_column = divmod(additional_obstacle, self.grid.stride)
+        stride = self.grid.stride
+        turns = self.visited
+        turns.clear()
+        while True:
+            block = jumps[position * 4 + direction]
+            if direction == UP or direction == DOWN:
+                in_line = position % stride == obstacle_column
+            else:
+                in_line = position // stride == obstacle_row
+            if in_line and (position < additional_obstacle < block or block < additional_obstacle < position):
+                block = additional_obstacle
+
+            if cells[block] == BORDER:
+                return False
+
+            position = block - offsets[direction]
+            direction = (direction + 1) % 4
+            if not turns.add(position, direction):
+                return True
+
+    def walk_internal(self, position: int, direction: int, additional_obstacle: int | None) -> Tuple[list[State], bool]:
+        cells = self.grid.cells
+        offsets = self.grid.offsets
+        crate = ord(Field.CRATE)
+        # directions the guard left a cell in
+        visited = self.visited
+        visited.clear()
+        path: list[State] = []
         while True:
-            next_position = position.move(direction)
-            if not self.guard(next_position):
+            next_position = position + offsets[direction]
+            next_field = cells[next_position]
+            if next_field == BORDER:
                 break
 
-            next_field = self.get(next_position)
-            if next_field == Field.CRATE or next_position == additional_obstacle:
-                direction = direction.turn_right()
+            if next_field == crate or next_position == additional_obstacle:
+                direction = (direction + 1) % 4
             else:
-                if position in path:
-                    if direction in path[position]:
-                        # loop
-                        return path, True
-                    else:
-                        path[position].add(direction)
-                else:
-                    path[position] = {direction}
+                if not visited.add(position, direction):
+                    # loop
+                    return path, True
+                path.append((position, direction))
 
                 position = next_position
         return path, False
 
-    def get(self, position: Position) -> Field | None:
-        if not self.guard(position):
-            return None
-        return self.fields[position.y * self.dim_x + position.x]
+    def print(self):
+        for iy in range(self.dim_y):
+            print(self.grid.row(iy).decode())
 
-    def set(self, position: Position, field: Field):
-        if not self.guard(position):
-            return None
-        self.fields[position.y * self.dim_x + position.x] = field
 
-    def guard(self, position: Position) -> bool:
-        return 0 <= position.x < self.dim_x and 0 <= position.y < self.dim_y
+_shared_map: Map | None = None
 
-    def print(self):
-        for iy in range(self.dim_y):
-            line = "".join([self.get(Position(ix, iy)) for ix in range(self.dim_x)])
-            print(f"{line}")
+
+def _share_map(map: Map | None):
+    global _shared_map
+    if map is not None:
+        _shared_map = map
+
+
+def _find_obstacles(candidates: list[State]) -> set[int]:
+    return _shared_map.find_obstacles(candidates)
 
 
 type LineModel = str
@@ -138,15 +200,51 @@ def load_line(num: int, line: str) -> LineModel:
     return line.strip()
 
 
-def task(filename: str) -> int:
+def task(filename: str, workers: int | None = None) -> int:
     lines = parse_lines(filename, load_line)
     map = Map(list(lines))
-    return map.walk()
+    return map.walk(workers)
 
 
 class TestCases(unittest.TestCase):
+    def test_is_loop(self):
+        map = Map([
+            ".#..",
+            "...#",
+            "#^..",
+            "....",
+        ])
+        grid = map.grid
+        self.assertFalse(map.walk_internal(grid.index(1, 2), UP, None)[1])
+        self.assertTrue(map.walk_internal(grid.index(1, 2), UP, grid.index(2, 3))[1])
+        self.assertTrue(map.is_loop(grid.index(1, 2), UP, grid.index(2, 3)))
+        self.assertFalse(map.is_loop(grid.index(1, 2), UP, grid.index(3, 3)))
+        self.assertFalse(map.is_loop(grid.index(1, 2), UP, grid.index(0, 1)))
+
+    def test_is_loop_matches_walk(self):
+        rng = Random(3)
+        lines = ["".join("#" if rng.random() < 0.1 else "." for _ in range(30)) for _ in range(30)]
+        lines[15] = lines[15][:15] + "^" + lines[15][16:]
+        for map in (Map(lines), Map(list(parse_lines(data_example_filename(), load_line)))):
+            grid = map.grid
+            start = (map.guard_position, map.guard_direction)
+            path, _ = map.walk_internal(*start, None)
+            # every free cell as an obstacle for the walk from the start, and the cell ahead of
+            # every state on the path the way walk() picks its candidates
+            candidates = [(*start, index) for index in grid.indices() if grid.cells[index] == ord(Field.EMPTY)]
+            candidates += [(p, d, p + grid.offsets[d]) for p, d in path if grid.cells[p + grid.offsets[d]] == ord(Field.EMPTY)]
+            checked = 0
+            for position, direction, candidate in candidates:
+                if candidate == position:
+                    continue
+                expected = map.walk_internal(position, direction, candidate)[1]
+                self.assertEqual(map.is_loop(position, direction, candidate), expected, (position, direction, candidate))
+                checked += expected
+            self.assertGreater(checked, 0)
+
     def test_example(self):
         self.assertEqual(task(data_example_filename()), 6)
+        self.assertEqual(task(data_example_filename(), workers=2), 6)
 
     def test_task(self):
         self.assertEqual(task(data_filename()), 2013)
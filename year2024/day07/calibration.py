@@ -0,0 +1,124 @@
+import unittest
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from enum import IntEnum, auto
+
+from utilities.digits import suffix_power
+
+
+class Operator(IntEnum):
+    ADD = auto()
+    MULTIPLY = auto()
+    CONCATENATE = auto()
+
+    def undo(self, target: int, part: int, power: int) -> int | None:
+        # the left operand x with `x <op> part == target`, None when there is none;
+        # power is suffix_power(part), which is all concatenation needs
+        match self:
+            case Operator.ADD:
+                return target - part if target >= part else None
+            case Operator.MULTIPLY:
+                return target // part if part != 0 and target % part == 0 else None
+            case Operator.CONCATENATE:
+                return target // power if target % power == part else None
+
+
+TASK1_OPERATORS = (Operator.ADD, Operator.MULTIPLY)
+TASK2_OPERATORS = (Operator.ADD, Operator.MULTIPLY, Operator.CONCATENATE)
+
+
+def part_powers(parts: Sequence[int]) -> list[int]:
+    return [suffix_power(part) for part in parts]
+
+
+def calibrate(value: int, parts: Sequence[int], operators: Sequence[Operator], powers: Sequence[int] | None = None) -> bool:
+    # searches backwards from the last part, undoing one operator per step; stops at the first
+    # solution and remembers the (index, target) states that have no solution
+    failed: set[tuple[int, int]] = set()
+    if powers is None:
+        powers = part_powers(parts)
+
+    def search(index: int, target: int) -> bool:
+        if index == 0:
+            return parts[0] == target
+        if (index, target) in failed:
+            return False
+        part, power = parts[index], powers[index]
+        for operator in operators:
+            if (left := operator.undo(target, part, power)) is not None and search(index - 1, left):
+                return True
+        failed.add((index, target))
+        return False
+
+    return len(parts) > 0 and search(len(parts) - 1, value)
+
+
+# (value, parts, powers), powers may be None when they are not known upfront
+type Equation = tuple[int, list[int], list[int] | None]
+
+
+def calibrated_sum(equations: Sequence[Equation], operators: Sequence[Operator]) -> int:
+    return sum(value for value, parts, powers in equations if calibrate(value, parts, operators, powers))
+
+
+def total_calibration(equations: Sequence[Equation], operators: Sequence[Operator], workers: int | None = None) -> int:
+    if workers is None or workers <= 1:
+        return calibrated_sum(equations, operators)
+
+    # the search space grows exponentially with the operand count: schedule the biggest equations
+    # first and cut the queue into chunks of about equal estimated cost, so idle workers keep
+    # picking up work until the cheap tail is drained
+    def cost(equation: Equation) -> int:
+        return len(operators) ** max(0, len(equation[1]) - 1)
+
+    ordered = sorted(equations, key=cost, reverse=True)
+    chunk_cost = max(1, sum(cost(e) for e in ordered) // (workers * 8))
+    chunks: list[list[Equation]] = []
+    current: list[Equation] = []
+    current_cost = 0
+    for equation in ordered:
+        current.append(equation)
+        current_cost += cost(equation)
+        if current_cost >= chunk_cost:
+            chunks.append(current)
+            current = []
+            current_cost = 0
+    if current:
+        chunks.append(current)
+
+    with ProcessPoolExecutor(workers) as executor:
+        return sum(executor.map(calibrated_sum, chunks, [operators] * len(chunks)))
+
+
+class TestCases(unittest.TestCase):
+    def test_undo(self):
+        self.assertEqual(Operator.ADD.undo(10, 4, 10), 6)
+        self.assertEqual(Operator.ADD.undo(3, 4, 10), None)
+        self.assertEqual(Operator.MULTIPLY.undo(12, 4, 10), 3)
+        self.assertEqual(Operator.MULTIPLY.undo(13, 4, 10), None)
+        self.assertEqual(Operator.CONCATENATE.undo(156, 6, 10), 15)
+        self.assertEqual(Operator.CONCATENATE.undo(7291, 91, 100), 72)
+        self.assertEqual(Operator.CONCATENATE.undo(7291, 92, 100), None)
+
+    def test_calibrate(self):
+        self.assertTrue(calibrate(190, [10, 19], TASK1_OPERATORS))
+        self.assertTrue(calibrate(3267, [81, 40, 27], TASK1_OPERATORS))
+        self.assertFalse(calibrate(7290, [6, 8, 6, 15], TASK1_OPERATORS))
+        self.assertTrue(calibrate(7290, [6, 8, 6, 15], TASK2_OPERATORS))
+        self.assertTrue(calibrate(156, [15, 6], TASK2_OPERATORS))
+        self.assertFalse(calibrate(83, [17, 5], TASK2_OPERATORS))
+        self.assertFalse(calibrate(1, [], TASK2_OPERATORS))
+        self.assertTrue(calibrate(7290, [6, 8, 6, 15], TASK2_OPERATORS, part_powers([6, 8, 6, 15])))
+
+    def test_calibrate_long_rows(self):
+        self.assertTrue(calibrate(30, [1] * 30, TASK2_OPERATORS))
+        self.assertFalse(calibrate(31, [1] * 30, TASK1_OPERATORS))
+        self.assertFalse(calibrate(10 ** 40 + 7, [1] * 40, TASK2_OPERATORS))
+
+    def test_total_calibration(self):
+        rows = [(190, [10, 19]), (3267, [81, 40, 27]), (83, [17, 5]), (156, [15, 6]), (7290, [6, 8, 6, 15])]
+        equations = [(value, parts, None) for value, parts in rows]
+        self.assertEqual(total_calibration(equations, TASK1_OPERATORS), 190 + 3267)
+        self.assertEqual(total_calibration(equations, TASK2_OPERATORS), 190 + 3267 + 156 + 7290)
+        for workers in (2, 3):
+            self.assertEqual(total_calibration(equations, TASK2_OPERATORS, workers), 190 + 3267 + 156 + 7290)
@@ -4,6 +4,7 @@ from typing import Self
 
 from utilities.file import data_example_filename, data_filename
 from utilities.parse import parse_lines
+from year2024.day07.calibration import calibrate, total_calibration, TASK1_OPERATORS
 
 
 @dataclass
@@ -33,6 +34,11 @@ class Row:
 
         return ret
 
+    @property
+    def is_calibrated(self) -> bool:
+        return calibrate(self.value, self.parts, TASK1_OPERATORS)
+
+
 type LineModel = Row
 
 
@@ -40,13 +46,9 @@ def load_line(num: int, line: str) -> LineModel:
     return Row.parse(line)
 
 
-def task(filename: str) -> int:
-    ret = 0
+def task(filename: str, workers: int | None = None) -> int:
     rows = parse_lines(filename, load_line)
-    for row in rows:
-        if row.calibrate() > 0:
-            ret += row.value
-    return ret
+    return total_calibration([(row.value, row.parts, None) for row in rows], TASK1_OPERATORS, workers)
 
 
 class TestCases(unittest.TestCase):
@@ -60,8 +62,16 @@ class TestCases(unittest.TestCase):
         self.assertEqual(Row.parse("83: 17 5").calibrate(), 0)
         self.assertEqual(Row.parse("7290: 6 8 6 15").calibrate(), 0)
 
+    def test_is_calibrated(self):
+        for line in ["156: 15 6", "190: 10 19", "3267: 81 40 27", "292: 11 6 16 20", "83: 17 5", "7290: 6 8 6 15"]:
+            row = Row.parse(line)
+            self.assertEqual(row.is_calibrated, row.calibrate() > 0, line)
+
     def test_example(self):
         self.assertEqual(task(data_example_filename()), 3749)
 
+    def test_task_parallel(self):
+        self.assertEqual(task(data_example_filename(), workers=2), task(data_example_filename()))
+
     def test_task(self):
         self.assertEqual(task(data_filename()), 4122618559853)
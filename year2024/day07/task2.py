@@ -1,24 +1,24 @@
 import unittest
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Self
 
 from utilities.file import data_example_filename, data_filename
+from utilities.digits import split
 from utilities.parse import parse_lines
+from year2024.day07.calibration import calibrate, part_powers, total_calibration, TASK2_OPERATORS
 
 def cut_suffix(a: int, b: int) -> int | None:
-    while b > 0:
-        ra = a % 10
-        rb = b % 10
-        if ra != rb:
-            return None
-        a = (a - ra) // 10
-        b = (b - rb) // 10
-    return a
+    return split(a, b)
 
 @dataclass
 class Row:
     value: int
     parts: list[int]
+    # suffix_power of every part, computed once when the row is created
+    powers: list[int] = field(init=False, compare=False, repr=False)
+
+    def __post_init__(self):
+        self.powers = part_powers(self.parts)
 
     @classmethod
     def parse(cls, line: str) -> Self:
@@ -45,6 +45,11 @@ class Row:
 
         return ret
 
+    @property
+    def is_calibrated(self) -> bool:
+        return calibrate(self.value, self.parts, TASK2_OPERATORS, self.powers)
+
+
 type LineModel = Row
 
 
@@ -52,13 +57,9 @@ def load_line(num: int, line: str) -> LineModel:
     return Row.parse(line)
 
 
-def task(filename: str) -> int:
-    ret = 0
+def task(filename: str, workers: int | None = None) -> int:
     rows = parse_lines(filename, load_line)
-    for row in rows:
-        if row.calibrate() > 0:
-            ret += row.value
-    return ret
+    return total_calibration([(row.value, row.parts, row.powers) for row in rows], TASK2_OPERATORS, workers)
 
 
 class TestCases(unittest.TestCase):
@@ -68,6 +69,8 @@ class TestCases(unittest.TestCase):
     def test_cut_suffix(self):
         self.assertEqual(cut_suffix(156, 6), 15)
         self.assertEqual(cut_suffix(7291, 91), 72)
+        self.assertEqual(cut_suffix(7291, 92), None)
+        self.assertEqual(cut_suffix(5, 15), None)
 
     def test_calibrate(self):
         self.assertEqual(Row.parse("156: 15 6").calibrate(), 1)
@@ -77,8 +80,16 @@ class TestCases(unittest.TestCase):
         self.assertEqual(Row.parse("83: 17 5").calibrate(), 0)
         self.assertEqual(Row.parse("7290: 6 8 6 15").calibrate(), 1)
 
+    def test_is_calibrated(self):
+        for line in ["156: 15 6", "190: 10 19", "3267: 81 40 27", "292: 11 6 16 20", "83: 17 5", "7290: 6 8 6 15"]:
+            row = Row.parse(line)
+            self.assertEqual(row.is_calibrated, row.calibrate() > 0, line)
+
     def test_example(self):
         self.assertEqual(task(data_example_filename()), 11387)
 
+    def test_task_parallel(self):
+        self.assertEqual(task(data_example_filename(), workers=2), task(data_example_filename()))
+
     def test_task(self):
         self.assertEqual(task(data_filename()), 227615740238334)
@@ -1,4 +1,5 @@
 import unittest
+from random import Random
 from dataclasses import dataclass
 from typing import Self, Tuple
 
@@ -91,12 +92,45 @@ class Disk:
     def checksum(self) -> int:
         ret = 0
         for file in self.files:
-            for i in range(file.range.begin, file.range.end):
-               ret += file.id * i
+            # arithmetic series of the block positions begin..end-1
+            ret += file.id * (file.range.begin + file.range.end - 1) * file.range.len // 2
 
         return ret
 
 
+def compact_checksum(disk_map: str) -> int:
+    # streams over the dense disk map with two cursors: the left one walks the blocks in place order,
+    # the right one hands out the blocks of the last file that wasn't moved yet
+    ret = 0
+    position = 0
+    left = 0
+    right = len(disk_map) - 1
+    if right % 2 == 1:
+        right -= 1
+    right_left = int(disk_map[right]) if right >= 0 else 0
+
+    while left < right:
+        length = int(disk_map[left])
+        if left % 2 == 0:
+            ret += (left // 2) * (2 * position + length - 1) * length // 2
+            position += length
+        else:
+            while length > 0 and left < right:
+                taken = min(length, right_left)
+                ret += (right // 2) * (2 * position + taken - 1) * taken // 2
+                position += taken
+                length -= taken
+                right_left -= taken
+                if right_left == 0:
+                    right -= 2
+                    right_left = int(disk_map[right])
+        left += 1
+
+    if left == right:
+        ret += (right // 2) * (2 * position + right_left - 1) * right_left // 2
+    return ret
+
+
 type LineModel = Disk
 
 
@@ -104,10 +138,14 @@ def load_line(num: int, line: str) -> LineModel:
     return Disk.parse(line)
 
 
+def load_disk_map(num: int, line: str) -> str:
+    return line.strip()
+
+
 def task(filename: str) -> int:
-    disks = list(parse_lines(filename, load_line))
-    assert len(disks) == 1
-    return disks[0].compact().checksum
+    disk_maps = list(parse_lines(filename, load_disk_map))
+    assert len(disk_maps) == 1
+    return compact_checksum(disk_maps[0])
 
 
 class TestCases(unittest.TestCase):
@@ -197,6 +235,20 @@ class TestCases(unittest.TestCase):
 
         self.assertEqual(input.compact(), expected)
 
+    def test_compact_checksum(self):
+        self.assertEqual(compact_checksum("2333133121414131402"), 1928)
+        self.assertEqual(compact_checksum("12345"), load_line(0, "12345").compact().checksum)
+        self.assertEqual(compact_checksum("90909"), load_line(0, "90909").compact().checksum)
+        self.assertEqual(compact_checksum("1"), 0)
+        rng = Random(9)
+        for _ in range(200):
+            disk_map = "".join(str(rng.randint(0 if i % 2 else 1, 9)) for i in range(rng.randint(1, 30)))
+            self.assertEqual(compact_checksum(disk_map), load_line(0, disk_map).compact().checksum, disk_map)
+
+    def test_checksum(self):
+        disk = Disk([File(0, Range(0, 2)), File(9, Range(2, 4)), File(8, Range(4, 7))], [])
+        self.assertEqual(disk.checksum, 9 * 2 + 9 * 3 + 8 * 4 + 8 * 5 + 8 * 6)
+
     def test_example(self):
         self.assertEqual(task(data_example_filename()), 1928)
 
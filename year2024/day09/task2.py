@@ -1,5 +1,5 @@
 import unittest
-from bisect import insort
+from heapq import heapify, heappop, heappush
 from dataclasses import dataclass
 from typing import Self, Tuple
 
@@ -64,30 +64,40 @@ class Disk:
         # 00...111...2...333.44.5555.6666.777.888899
         # 00992111777.44.333....5555.6666.....8888..
 
+        # one min-heap of gap starts per gap length, so the leftmost gap of length >= k is
+        # the smallest head among the heaps k..max
+        max_len = max((r.len for r in self.empty), default=0)
+        gaps: list[list[int]] = [[] for _ in range(max_len + 1)]
+        for r in self.empty:
+            gaps[r.len].append(r.begin)
+        for heap in gaps:
+            heapify(heap)
+
         new_files = []
-        files = self.files.copy()
-        files.reverse()
-        empty = self.empty.copy()
-
-        for file in files:
-            for i in range(len(empty)):
-                candidate = empty[i]
-                if candidate.begin > file.range.begin:
-                    continue
-                if candidate.len >= file.range.len:
-                    # move the file
-                    front, back = candidate.split(file.range.len)
-                    new_files.append(File(file.id, front))
-                    insort(empty, file.range, key=lambda a: a.begin)
-                    if back.len > 0:
-                        empty[i] = back
-                    else:
-                        del empty[i]
-                    break
-            else:
+        freed = []
+        for file in reversed(self.files):
+            best_len = None
+            best_begin = file.range.begin
+            for gap_len in range(file.range.len, max_len + 1):
+                heap = gaps[gap_len]
+                if heap and heap[0] < best_begin:
+                    best_len = gap_len
+                    best_begin = heap[0]
+
+            if best_len is None:
                 # keep it as is
                 new_files.append(file)
+                continue
+
+            # move the file
+            heappop(gaps[best_len])
+            front, back = Range(best_begin, best_begin + best_len).split(file.range.len)
+            new_files.append(File(file.id, front))
+            freed.append(file.range)
+            if back.len > 0:
+                heappush(gaps[back.len], back.begin)
 
+        empty = freed + [Range(begin, begin + gap_len) for gap_len, heap in enumerate(gaps) for begin in heap]
         new_files.sort(key=lambda a: a.range.begin)
         empty.sort(key=lambda a: a.begin)
         return Disk(new_files, empty)
@@ -96,8 +106,8 @@ class Disk:
     def checksum(self) -> int:
         ret = 0
         for file in self.files:
-            for i in range(file.range.begin, file.range.end):
-               ret += file.id * i
+            # arithmetic series of the block positions begin..end-1
+            ret += file.id * (file.range.begin + file.range.end - 1) * file.range.len // 2
 
         return ret
 
@@ -209,6 +219,10 @@ class TestCases(unittest.TestCase):
 
         self.assertEqual(input.compact(), expected)
 
+    def test_checksum(self):
+        disk = Disk([File(0, Range(0, 2)), File(9, Range(2, 4)), File(8, Range(4, 7))], [])
+        self.assertEqual(disk.checksum, 9 * 2 + 9 * 3 + 8 * 4 + 8 * 5 + 8 * 6)
+
     def test_example(self):
         self.assertEqual(task(data_example_filename()), 2858)
 
@@ -1,9 +1,7 @@
 import unittest
-from dataclasses import dataclass, field
-from email.policy import default
-from typing import Self, Sequence
 
 from utilities.file import data_example_filename, data_filename
+from utilities.grid import Grid
 from utilities.parse import parse_lines
 
 type LineModel = list[int]
@@ -13,78 +11,43 @@ def load_line(num: int, line: str) -> LineModel:
     return [int(ch) for ch in line.strip()]
 
 
-@dataclass(frozen=True)
-class Position:
-    x: int
-    y: int
-
-    def neighbors(self) -> Sequence[Self]:
-        yield Position(self.x + 1, self.y)
-        yield Position(self.x, self.y + 1)
-        yield Position(self.x - 1, self.y)
-        yield Position(self.x, self.y - 1)
-
-
-@dataclass
-class Node:
-    value: int
-    position: Position
-    next: list[Self] = field(default_factory=list)
+BORDER = 0xFF
 
 
 class Map:
     def __init__(self, input: list[list[int]]):
-        self.dim_x = len(input[0])
-        self.dim_y = len(input)
-
-        nodes = []
-        for iy, line in enumerate(input):
-            for ix, value in enumerate(line):
-                nodes.append(Node(value, Position(ix, iy)))
-
-        self.nodes = nodes
-        for node in self.nodes:
-            for np in node.position.neighbors():
-                if (neighbor := self.get(np)) is None:
-                    continue
-                if neighbor.value == node.value + 1:
-                    node.next.append(neighbor)
+        self.grid = Grid(input, BORDER)
+        self.dim_x = self.grid.dim_x
+        self.dim_y = self.grid.dim_y
+
+    def next(self, index: int) -> list[int]:
+        cells = self.grid.cells
+        value = cells[index] + 1
+        return [n for n in self.grid.neighbors(index) if cells[n] == value]
+
+    def layers(self) -> list[list[int]]:
+        layers: list[list[int]] = [[] for _ in range(10)]
+        cells = self.grid.cells
+        for index in self.grid.indices():
+            layers[cells[index]].append(index)
+        return layers
 
     def walk_all(self) -> int:
-        ret = 0
-        for node in self.nodes:
-            if node.value != 0:
-                continue
-            ret += self.walk_starting(node.position)
-        return ret
-
-    def walk_starting(self, position: Position) -> int:
-        ret = 0
-        visited: set[Position] = set()
-        waiting = [self.get(position)]
-        while waiting:
-            node = waiting.pop()
-            visited.add(node.position)
-            for nn in node.next:
-                if nn.position in visited:
-                    continue
-                if nn.value == 9:
-                    ret += 1
-                waiting.append(nn)
-        return ret
-
-    def get(self, position: Position) -> Node | None:
-        if not self.guard(position):
-            return None
-        return self.nodes[position.y * self.dim_x + position.x]
-
-    def set(self, position: Position, field: Node):
-        if not self.guard(position):
-            return None
-        self.nodes[position.y * self.dim_x + position.x] = field
-
-    def guard(self, position: Position) -> bool:
-        return 0 <= position.x < self.dim_x and 0 <= position.y < self.dim_y
+        # one pass from height 9 down to 0, every cell collects the set of 9s it can reach;
+        # only the sets of the layer above are kept alive
+        cells = self.grid.cells
+        layers = self.layers()
+        above: dict[int, set[int]] = {index: {index} for index in layers[9]}
+        for height in range(8, -1, -1):
+            current: dict[int, set[int]] = {}
+            for index in layers[height]:
+                reachable = set()
+                for nn in self.grid.neighbors(index):
+                    if cells[nn] == height + 1:
+                        reachable |= above[nn]
+                current[index] = reachable
+            above = current
+        return sum(len(reachable) for reachable in above.values())
 
 
 def task(filename: str) -> int:
@@ -102,17 +65,14 @@ class TestCases(unittest.TestCase):
         self.assertEqual(map.dim_x, 3)
         self.assertEqual(map.dim_y, 2)
 
-        node0 = map.get(Position(0, 0))
-        self.assertEqual(node0.value, 1)
-        self.assertEqual(node0.position, Position(0, 0))
-        node1 = map.get(Position(2, 1))
-        self.assertEqual(node1.value, 5)
-        self.assertEqual(node1.position, Position(2, 1))
-
-        self.assertTrue(map.get(Position(1, 0)) in map.get(Position(0, 0)).next)
-        self.assertFalse(map.get(Position(0, 1)) in map.get(Position(0, 0)).next)
-        self.assertTrue(map.get(Position(2, 0)) in map.get(Position(1, 0)).next)
-        self.assertTrue(map.get(Position(1, 1)) in map.get(Position(1, 0)).next)
+        grid = map.grid
+        self.assertEqual(grid.cells[grid.index(0, 0)], 1)
+        self.assertEqual(grid.cells[grid.index(2, 1)], 5)
+
+        self.assertTrue(grid.index(1, 0) in map.next(grid.index(0, 0)))
+        self.assertFalse(grid.index(0, 1) in map.next(grid.index(0, 0)))
+        self.assertTrue(grid.index(2, 0) in map.next(grid.index(1, 0)))
+        self.assertTrue(grid.index(1, 1) in map.next(grid.index(1, 0)))
 
     def test_example(self):
         self.assertEqual(task(data_example_filename()), 36)
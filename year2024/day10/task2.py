@@ -1,9 +1,13 @@
 import unittest
-from dataclasses import dataclass, field
-from email.policy import default
-from typing import Self, Sequence
+from random import Random
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 from utilities.file import data_example_filename, data_filename
+from utilities.grid import Grid
 from utilities.parse import parse_lines
 
 type LineModel = list[int]
@@ -13,87 +17,70 @@ def load_line(num: int, line: str) -> LineModel:
     return [int(ch) for ch in line.strip()]
 
 
-@dataclass(frozen=True)
-class Position:
-    x: int
-    y: int
-
-    def neighbors(self) -> Sequence[Self]:
-        yield Position(self.x + 1, self.y)
-        yield Position(self.x, self.y + 1)
-        yield Position(self.x - 1, self.y)
-        yield Position(self.x, self.y - 1)
-
-
-@dataclass
-class Node:
-    value: int
-    position: Position
-    next: list[Self] = field(default_factory=list)
-
-    def __repr__(self) -> str:
-        return f"(Node({self.position.x, self.position.y} -> {self.value})"
+BORDER = 0xFF
 
 
 class Map:
     def __init__(self, input: list[list[int]]):
-        self.dim_x = len(input[0])
-        self.dim_y = len(input)
-
-        nodes = []
-        for iy, line in enumerate(input):
-            for ix, value in enumerate(line):
-                nodes.append(Node(value, Position(ix, iy)))
-
-        self.nodes = nodes
-        for node in self.nodes:
-            for np in node.position.neighbors():
-                if not self.guard(np):
-                    continue
-                neighbor = self.get(np)
-                if neighbor.value == node.value + 1:
-                    node.next.append(neighbor)
+        self.grid = Grid(input, BORDER)
+        self.dim_x = self.grid.dim_x
+        self.dim_y = self.grid.dim_y
+
+    def next(self, index: int) -> list[int]:
+        cells = self.grid.cells
+        value = cells[index] + 1
+        return [n for n in self.grid.neighbors(index) if cells[n] == value]
+
+    def layers(self) -> list[list[int]]:
+        layers: list[list[int]] = [[] for _ in range(10)]
+        cells = self.grid.cells
+        for index in self.grid.indices():
+            layers[cells[index]].append(index)
+        return layers
 
     def walk_all(self) -> int:
-        ret = 0
-        for node in self.nodes:
-            if node.value != 0:
-                continue
-            ret += self.walk_starting(node.position)
-        return ret
-
-    def walk_starting(self, position: Position) -> int:
-        waiting = [self.get(position)]
-        visited: dict[Position, int] = {position: 1}
-        end_positions = set()
-        while waiting:
-            node = waiting.pop(0)
-            rating = visited[node.position]
-            for nn in node.next:
-                if nn.value == 9:
-                    end_positions.add(nn.position)
-                if nn.position not in visited:
-                    waiting.append(nn)
-                visited[nn.position] = visited.get(nn.position, 0) + rating
-        return sum([visited[p] for p in end_positions])
-
-    def get(self, position: Position) -> Node:
-        assert self.guard(position)
-        return self.nodes[position.y * self.dim_x + position.x]
-
-    def set(self, position: Position, field: Node):
-        if not self.guard(position):
-            return None
-        self.nodes[position.y * self.dim_x + position.x] = field
-
-    def guard(self, position: Position) -> bool:
-        return 0 <= position.x < self.dim_x and 0 <= position.y < self.dim_y
-
-
-def task(filename: str) -> int:
+        # one pass from height 9 down to 0, the rating of a cell is the sum of the ratings of its uphill neighbors
+        cells = self.grid.cells
+        layers = self.layers()
+        ratings = [0] * len(cells)
+        for index in layers[9]:
+            ratings[index] = 1
+        for height in range(8, -1, -1):
+            for index in layers[height]:
+                rating = 0
+                for nn in self.grid.neighbors(index):
+                    if cells[nn] == height + 1:
+                        rating += ratings[nn]
+                ratings[index] = rating
+        return sum(ratings[index] for index in layers[0])
+
+    def walk_all_numpy(self) -> int:
+        # same layer by layer propagation, with the 4 neighbor sums done as shifted whole-array additions;
+        # the border keeps the shifts from wrapping between rows
+        assert numpy is not None, "the numpy backend requires numpy"
+        heights = numpy.frombuffer(self.grid.cells, dtype=numpy.uint8).reshape(self.dim_y + 2, self.grid.stride)
+        ratings = (heights == 9).astype(numpy.int64)
+        for height in range(8, -1, -1):
+            uphill = numpy.where(heights == height + 1, ratings, 0)
+            total = numpy.zeros_like(ratings)
+            total[1:, :] += uphill[:-1, :]
+            total[:-1, :] += uphill[1:, :]
+            total[:, 1:] += uphill[:, :-1]
+            total[:, :-1] += uphill[:, 1:]
+            ratings = numpy.where(heights == height, total, ratings)
+        return int(ratings[heights == 0].sum())
+
+
+def task(filename: str, backend: str = "python") -> int:
     lines = list(parse_lines(filename, load_line))
     map = Map(lines)
-    return map.walk_all()
+    match backend:
+        case "numpy":
+            return map.walk_all_numpy()
+        case "python":
+            return map.walk_all()
+        case _:
+            raise ValueError(f"unknown backend {backend!r}")
 
 
 class TestCases(unittest.TestCase):
@@ -105,17 +92,27 @@ class TestCases(unittest.TestCase):
         self.assertEqual(map.dim_x, 3)
         self.assertEqual(map.dim_y, 2)
 
-        node0 = map.get(Position(0, 0))
-        self.assertEqual(node0.value, 1)
-        self.assertEqual(node0.position, Position(0, 0))
-        node1 = map.get(Position(2, 1))
-        self.assertEqual(node1.value, 5)
-        self.assertEqual(node1.position, Position(2, 1))
-
-        self.assertTrue(map.get(Position(1, 0)) in map.get(Position(0, 0)).next)
-        self.assertFalse(map.get(Position(0, 1)) in map.get(Position(0, 0)).next)
-        self.assertTrue(map.get(Position(2, 0)) in map.get(Position(1, 0)).next)
-        self.assertTrue(map.get(Position(1, 1)) in map.get(Position(1, 0)).next)
+        grid = map.grid
+        self.assertEqual(grid.cells[grid.index(0, 0)], 1)
+        self.assertEqual(grid.cells[grid.index(2, 1)], 5)
+
+        self.assertTrue(grid.index(1, 0) in map.next(grid.index(0, 0)))
+        self.assertFalse(grid.index(0, 1) in map.next(grid.index(0, 0)))
+        self.assertTrue(grid.index(2, 0) in map.next(grid.index(1, 0)))
+        self.assertTrue(grid.index(1, 1) in map.next(grid.index(1, 0)))
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_walk_all_numpy(self):
+        rng = Random(10)
+        for _ in range(20):
+            dim_x, dim_y = rng.randint(1, 30), rng.randint(1, 30)
+            map = Map([[rng.randint(0, 9) for _ in range(dim_x)] for _ in range(dim_y)])
+            self.assertEqual(map.walk_all_numpy(), map.walk_all())
+        self.assertEqual(task(data_example_filename(), backend="numpy"), 81)
+        self.assertEqual(task(data_filename(), backend="numpy"), 1324)
+
+    def test_unknown_backend(self):
+        self.assertRaises(ValueError, task, data_example_filename(), backend="numpi")
 
     def test_example(self):
         self.assertEqual(task(data_example_filename()), 81)
@@ -1,9 +1,19 @@
+import math
+import re
 import unittest
-from dataclasses import dataclass
+from dataclasses import dataclass, astuple
 from typing import Self, Tuple
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from utilities.file import data_example_filename, data_filename
-from utilities.parse import parse_lines, LineStream, parse
+from utilities.parse import map_file, parse_records
+
+
+PATTERN = re.compile(rb"Button A: X\+(\d+), Y\+(\d+)\s+Button B: X\+(\d+), Y\+(\d+)\s+Prize: X=(\d+), Y=(\d+)")
 
 
 @dataclass
@@ -16,50 +26,40 @@ class Challenge:
     prize_y: int
 
     @classmethod
-    def parse(cls, stream: LineStream) -> Self:
-        def parse_line(expected: str, separator: str, line: str) -> Tuple[int, int] | None:
-            line = line.strip()
-            if len(line) == 0:
-                return None
-
-            prefix, values = line.split(":", maxsplit=1)
-            if prefix != expected:
-                return None
-            x_part, y_part = values.split(",", maxsplit=1)
-            x_part_left, x_part_right = x_part.strip().split(separator, maxsplit=1)
-            y_part_left, y_part_right = y_part.strip().split(separator, maxsplit=1)
-            if x_part_left != 'X' or y_part_left != 'Y':
-                return None
-            return int(x_part_right), int(y_part_right)
-
-
-        while True:
-            if (button_a := parse_line("Button A", "+", next(stream))) is None:
-                continue
-            if (button_b := parse_line("Button B", "+", next(stream))) is None:
-                continue
-            if (prize := parse_line("Prize", "=", next(stream))) is None:
-                continue
-            return cls(
-                button_a[0],
-                button_a[1],
-                button_b[0],
-                button_b[1],
-                prize[0],
-                prize[1]
-            )
+    def parse(cls, text: str) -> Self | None:
+        if (match := PATTERN.search(text.encode())) is None:
+            return None
+        return cls.from_match(match)
+
+    @classmethod
+    def from_match(cls, match: re.Match[bytes]) -> Self:
+        return cls(*(int(v) for v in match.groups()))
 
     def cost(self) -> int:
-        a = (self.prize_y * self.button_b_x - self.prize_x * self.button_b_y) / (self.button_a_y * self.button_b_x - self.button_a_x * self.button_b_y)
-        if not a.is_integer():
+        # Cramer's rule, in exact integers so big prizes can't be misclassified by float rounding
+        det = self.button_a_x * self.button_b_y - self.button_a_y * self.button_b_x
+        if det == 0:
+            return self.cost_collinear()
+
+        a, ra = divmod(self.prize_x * self.button_b_y - self.prize_y * self.button_b_x, det)
+        if ra != 0 or a < 0:
             return 0
 
-        b = (self.prize_y * self.button_a_x - self.prize_x * self.button_a_y) / (
-                    self.button_b_y * self.button_a_x - self.button_b_x * self.button_a_y)
-        if not b.is_integer():
+        b, rb = divmod(self.button_a_x * self.prize_y - self.button_a_y * self.prize_x, det)
+        if rb != 0 or b < 0:
             return 0
 
-        return int(a) * 3 + int(b)
+        return a * 3 + b
+
+    def cost_collinear(self) -> int:
+        # both buttons move along one line: the prize has to lie on it, then one coordinate
+        # decides how often each button is pressed
+        ax, ay, bx, by, px, py = astuple(self)
+        if ax * py - ay * px != 0 or bx * py - by * px != 0:
+            return 0
+        if ax != 0 or bx != 0:
+            return cheapest_presses(ax, bx, px)
+        return cheapest_presses(ay, by, py)
 
         # p1 = (self.prize_y * self.button_a_x / self.button_a_y - self.prize_x)
         # p2 = (self.button_b_y * self.button_a_x / self.button_a_y - self.button_b_x)
@@ -81,29 +81,138 @@ class Challenge:
         # return a * 3 + b
 
 
+def cheapest_presses(a_step: int, b_step: int, target: int) -> int:
+    # smallest 3 * a + b with a * a_step + b * b_step == target and a, b >= 0, 0 when there is none
+    if a_step <= 0 and b_step <= 0:
+        a_step, b_step, target = -a_step, -b_step, -target
+    if a_step < 0 or b_step < 0:
+        raise ValueError("buttons moving in opposite directions")
+    if a_step == 0 or b_step == 0:
+        # a button that doesn't move is never worth pressing
+        step, price = (b_step, 1) if a_step == 0 else (a_step, 3)
+        if step == 0:
+            return 0
+        presses, rest = divmod(target, step)
+        return presses * price if rest == 0 and presses >= 0 else 0
+
+    g = math.gcd(a_step, b_step)
+    if target % g != 0:
+        return 0
+    a_unit, b_unit = a_step // g, b_step // g
+    # the fewest a presses, then every further solution trades b_unit presses of a for a_unit of b
+    a = target // g * pow(a_unit, -1, b_unit) % b_unit
+    b = (target - a * a_step) // b_step
+    if b < 0:
+        return 0
+    if 3 * b_unit < a_unit:
+        k = b // a_unit
+        a, b = a + k * b_unit, b - k * a_unit
+    return a * 3 + b
+
+
+type Columns = Tuple["numpy.ndarray", "numpy.ndarray", "numpy.ndarray", "numpy.ndarray", "numpy.ndarray", "numpy.ndarray"]
+
+
+def to_columns(challenges: list[Challenge]) -> Columns:
+    return columns_from_rows(numpy.array([astuple(c) for c in challenges], dtype=object).reshape(-1, 6))
+
+
+def load_columns(filename: str) -> Columns:
+    # all six numbers of every machine in one regex pass, converted to integers by numpy
+    with map_file(filename) as buffer:
+        rows = numpy.array(PATTERN.findall(buffer), dtype=numpy.bytes_).reshape(-1, 6).astype(numpy.int64)
+    return columns_from_rows(rows)
+
+
+def columns_from_rows(rows: "numpy.ndarray") -> Columns:
+    # the products in Cramer's rule (button * button, button * prize) have to fit into int64,
+    # otherwise stay with python ints
+    button = int(numpy.abs(rows[:, :4]).max(initial=0))
+    prize = int(numpy.abs(rows[:, 4:]).max(initial=0))
+    rows = rows.astype(numpy.int64 if 2 * button * max(button, prize) < 2 ** 63 else object)
+    return tuple(rows[:, i] for i in range(6))
+
+
+def total_cost_columns(columns: Columns) -> int:
+    button_a_x, button_a_y, button_b_x, button_b_y, prize_x, prize_y = columns
+    det = button_a_x * button_b_y - button_a_y * button_b_x
+    collinear = det == 0
+    solvable = ~collinear
+    det = numpy.where(solvable, det, 1)
+
+    a_num = prize_x * button_b_y - prize_y * button_b_x
+    b_num = button_a_x * prize_y - button_a_y * prize_x
+    a = a_num // det
+    b = b_num // det
+    solvable &= (a * det == a_num) & (b * det == b_num) & (a >= 0) & (b >= 0)
+    # the costs fit into int64 one by one, their total doesn't have to
+    total = int((a * 3 + b)[solvable].astype(object).sum())
+    for i in numpy.flatnonzero(collinear):
+        total += Challenge(*(int(column[i]) for column in columns)).cost_collinear()
+    return total
+
+
 type Model = Challenge
 
 
 def task(filename: str) -> int:
-    ret = 0
-    items = parse(filename, Challenge.parse)
-    for item in items:
-        ret += item.cost()
-    return ret
+    if numpy is not None:
+        return total_cost_columns(load_columns(filename))
+    return sum(c.cost() for c in parse_records(filename, PATTERN, Challenge.from_match))
 
 
 class TestCases(unittest.TestCase):
     def test_parse(self):
-        stream = LineStream.from_string("""
+        text = """
 Button A: X+94, Y+34
 Button B: X+22, Y+67
 Prize: X=8400, Y=5400
-        """)
-        self.assertEqual(Challenge.parse(stream), Challenge(94, 34, 22, 67, 8400, 5400))
+        """
+        self.assertEqual(Challenge.parse(text), Challenge(94, 34, 22, 67, 8400, 5400))
 
     def test_cost(self):
         self.assertEqual(Challenge(94, 34, 22, 67, 8400, 5400).cost(), 280)
         self.assertEqual(Challenge(26, 66, 67, 21, 12748, 12176).cost(), 0)
+        self.assertEqual(Challenge(1, 1, 2, 2, 3, 3).cost(), 4)
+        self.assertEqual(Challenge(1, 1, 2, 2, 3, 4).cost(), 0)
+        self.assertEqual(Challenge(3, 0, 0, 1, -3, 1).cost(), 0)
+
+    def test_cost_collinear(self):
+        # against trying every press count of button a
+        for a_step in range(1, 7):
+            for b_step in range(1, 7):
+                for target in range(0, 40):
+                    costs = [
+                        a * 3 + (target - a * a_step) // b_step
+                        for a in range(target // a_step + 1)
+                        if (target - a * a_step) % b_step == 0
+                    ]
+                    expected = min(costs, default=0)
+                    challenge = Challenge(a_step, 2 * a_step, b_step, 2 * b_step, target, 2 * target)
+                    self.assertEqual(challenge.cost(), expected, (a_step, b_step, target))
+        self.assertEqual(Challenge(0, 0, 2, 2, 6, 6).cost(), 3)
+        self.assertEqual(Challenge(0, 0, 0, 0, 6, 6).cost(), 0)
+        self.assertRaises(ValueError, Challenge(1, 1, -1, -1, 6, 6).cost)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_total_cost_columns(self):
+        challenges = [
+            Challenge(94, 34, 22, 67, 8400, 5400),
+            Challenge(26, 66, 67, 21, 12748, 12176),
+            Challenge(17, 86, 84, 37, 7870, 6450),
+            Challenge(1, 1, 2, 2, 3, 3),
+        ]
+        self.assertEqual(total_cost_columns(to_columns(challenges)), sum(c.cost() for c in challenges))
+        huge = [Challenge(3, 1, 1, 2, 4 * 10 ** 18, 3 * 10 ** 18)]
+        self.assertEqual(to_columns(huge)[0].dtype, object)
+        self.assertEqual(total_cost_columns(to_columns(huge)), huge[0].cost())
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_total_cost_columns_large_total(self):
+        challenges = [Challenge(1, 2, 2, 1, 3 * 10 ** 13, 3 * 10 ** 13)] * 400000
+        columns = to_columns(challenges)
+        self.assertEqual(columns[0].dtype, numpy.int64)
+        self.assertEqual(total_cost_columns(columns), 400000 * challenges[0].cost())
 
     def test_example(self):
         self.assertEqual(task(data_example_filename()), 480)